@@ -4,25 +4,34 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import re
+import signal
 from typing import Optional
-from dataclasses import dataclass, field
+from urllib.parse import urlparse
+from dataclasses import replace
+from functools import lru_cache
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application,
+    ApplicationHandlerStop,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
     ContextTypes,
+    TypeHandler,
     filters,
 )
 from telegram.constants import ParseMode
 
 from .config import load_config, Config
-from .llm import create_llm, BaseLLM
-from .processors import detect_and_process, extract_urls, ProcessedContent
+from .llm import (
+    create_llm, BaseLLM, SUMMARY_CONTENT_LIMIT, backoff_delay, is_rate_limited,
+)
+from .processors import close_http_client, detect_and_process, extract_urls, ProcessedContent
 from .tagger import Tagger
 from .publisher import TelegramPublisher
+from .util import TTLCache, normalize_url, run_async
 
 # Configure logging
 logging.basicConfig(
@@ -31,15 +40,160 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Only escape characters that need escaping in Markdown V1
+# (extend this set when moving to MarkdownV2)
+_MD_SPECIAL_CHARS = "_*[]`"
+_MD_ESCAPE = str.maketrans({char: f"\\{char}" for char in _MD_SPECIAL_CHARS})
+
+
+# Separators between words in URL slugs and titles
+_SLUG_SPLIT_PATTERN = re.compile(r"[\s\-_+.,:;!?()\[\]]+")
+
+# Static bot replies, built once
+_MODE_AUTO_TEXT = "🚀 直接发布"
+_MODE_PREVIEW_TEXT = "👀 预览确认"
+
+_START_TEMPLATE = (
+    "👋 你好 {name}!\n\n"
+    "发送链接给我，我会自动解析并发布到频道。\n\n"
+    "当前模式: {mode}\n\n"
+    "命令:\n"
+    "/mode - 切换发布模式\n"
+    "/cancel - 取消当前操作\n"
+    "/help - 帮助信息"
+)
+
+_HELP_TEXT = (
+    "📖 使用说明\n\n"
+    "1. 直接发送链接\n"
+    "2. 等待解析和摘要生成\n"
+    "3. 选择标签（点击按钮）\n"
+    "4. 确认发布\n\n"
+    "支持的链接类型:\n"
+    "• 普通网页\n"
+    "• ArXiv 论文\n"
+    "• 微信公众号文章\n"
+    "• 知乎（受限）\n\n"
+    "命令:\n"
+    "/mode - 切换直接发布/预览确认模式\n"
+    "/cancel - 取消当前操作"
+)
+
 
-@dataclass
 class PendingContent:
     """Content pending for tag selection and publishing."""
-    content: ProcessedContent
-    suggested_tags: list[str] = field(default_factory=list)
-    extra_tags: list[str] = field(default_factory=list)
-    selected_tags: set[str] = field(default_factory=set)
-    message_id: Optional[int] = None
+
+    # Slots keep per-user memory small while flows wait for a button press
+    # (dataclass(slots=True) needs Python 3.10+)
+    __slots__ = (
+        "content",
+        "suggested_tags",
+        "extra_tags",
+        "selected_tags",
+        "message_id",
+        "ordered_tags",
+        "edit_task",
+    )
+
+    def __init__(
+        self,
+        content: ProcessedContent,
+        suggested_tags: Optional[list[str]] = None,
+        extra_tags: Optional[list[str]] = None,
+        selected_tags: Optional[set[str]] = None,
+        message_id: Optional[int] = None,
+        ordered_tags: Optional[list[str]] = None,
+    ):
+        self.content = content
+        self.suggested_tags = suggested_tags if suggested_tags is not None else []
+        self.extra_tags = extra_tags if extra_tags is not None else []
+        self.selected_tags = selected_tags if selected_tags is not None else set()
+        self.message_id = message_id
+        # Keyboard tag order, computed once when the content is created
+        self.ordered_tags = ordered_tags if ordered_tags is not None else []
+        # Scheduled keyboard edit, used to coalesce rapid tag toggles
+        self.edit_task: Optional[asyncio.Task] = None
+
+
+def _title_hint_from_url(url: str) -> str:
+    """Guess a title from a readable URL slug, e.g. /posts/my-great-article."""
+    if not url.startswith(("http://", "https://")):
+        return ""
+    segments = [seg for seg in urlparse(url).path.split("/") if seg]
+    if not segments:
+        return ""
+    slug = segments[-1].rsplit(".", 1)[0]
+    words = [word for word in _SLUG_SPLIT_PATTERN.split(slug) if word.isalpha()]
+    # Short or numeric slugs (ids, dates) are too weak to guess from
+    if len(words) < 3:
+        return ""
+    return " ".join(words)
+
+
+def _titles_match(hint: str, title: str) -> bool:
+    """Check whether a slug-derived title hint covers most words of the real title."""
+    hint_words = set(hint.lower().split())
+    title_words = set(_SLUG_SPLIT_PATTERN.split(title.lower())) - {""}
+    if not hint_words or not title_words:
+        return False
+    return len(hint_words & title_words) >= len(title_words) / 2
+
+
+def _order_tags(
+    suggested_tags: list[str],
+    extra_tags: list[str],
+    preset_tags: list[str],
+    preset_set: frozenset[str],
+) -> list[str]:
+    """Order keyboard tags: suggested presets, extra tags, then remaining presets."""
+    # Add preset tags that are suggested, then extra generated tags
+    all_tags = [tag for tag in suggested_tags if tag in preset_set]
+    all_tags.extend(extra_tags)
+
+    # Add remaining preset tags
+    seen = set(all_tags)
+    for tag in preset_tags:
+        if tag not in seen:
+            all_tags.append(tag)
+            seen.add(tag)
+
+    return all_tags
+
+
+@lru_cache(maxsize=256)
+def _build_tag_keyboard(
+    tags: tuple[str, ...],
+    selected_tags: frozenset[str],
+) -> InlineKeyboardMarkup:
+    """Build the tag selection keyboard (memoized, keyboards are immutable)."""
+    keyboard = []
+
+    # Create tag buttons (3 per row)
+    row = []
+    for tag in tags:
+        is_selected = tag in selected_tags
+        button_text = f"✓ {tag}" if is_selected else tag
+        row.append(InlineKeyboardButton(button_text, callback_data=f"tag:{tag}"))
+
+        if len(row) == 3:
+            keyboard.append(row)
+            row = []
+
+    if row:
+        keyboard.append(row)
+
+    # Add action buttons
+    selected_count = len(selected_tags)
+    keyboard.append([
+        InlineKeyboardButton("🔄 清空", callback_data="clear"),
+        InlineKeyboardButton("✅ 全选", callback_data="select_all"),
+    ])
+    keyboard.append([
+        InlineKeyboardButton(f"📤 发布 ({selected_count})", callback_data="publish"),
+        InlineKeyboardButton("❌ 取消", callback_data="cancel"),
+    ])
+
+    return InlineKeyboardMarkup(keyboard)
 
 
 class KBBot:
@@ -52,12 +206,26 @@ class KBBot:
         self.publisher: Optional[TelegramPublisher] = None
         self.application: Optional[Application] = None
 
-        # Pending contents per user (chat_id -> PendingContent)
-        self.pending: dict[int, PendingContent] = {}
+        # Strong references to fire-and-forget tasks so they aren't garbage collected
+        self._background_tasks: set[asyncio.Task] = set()
+
+        # Pending contents per user (chat_id -> PendingContent), abandoned
+        # flows expire so they don't hold article text forever
+        self.pending = TTLCache(maxsize=1024, ttl=600)
+
+        # Recently processed URLs (normalized URL -> (content, suggested, extra))
+        self._url_cache = TTLCache(maxsize=512, ttl=3600)
 
         # Bot settings
         self.admin_user_id = self._get_admin_user_id()
         self.auto_publish = os.environ.get("KB_BOT_AUTO_PUBLISH", "false").lower() == "true"
+        self.max_concurrency = self._get_max_concurrency()
+
+        # Webhook mode (polling is used when no webhook URL is set)
+        self.webhook_url = os.environ.get("KB_BOT_WEBHOOK_URL", "")
+        self.webhook_port = self._get_webhook_port()
+        self.webhook_secret = os.environ.get("KB_BOT_WEBHOOK_SECRET", "")
+        self._pipeline_semaphore: Optional[asyncio.Semaphore] = None
 
     def _get_admin_user_id(self) -> Optional[int]:
         """Get admin user ID from environment."""
@@ -69,6 +237,26 @@ class KBBot:
                 logger.warning(f"Invalid KB_BOT_ADMIN_USER_ID: {user_id}")
         return None
 
+    def _get_webhook_port(self) -> int:
+        """Get webhook listen port from environment."""
+        port = os.environ.get("KB_BOT_WEBHOOK_PORT", "")
+        if port:
+            try:
+                return int(port)
+            except ValueError:
+                logger.warning(f"Invalid KB_BOT_WEBHOOK_PORT: {port}")
+        return 8443
+
+    def _get_max_concurrency(self) -> int:
+        """Get max concurrent processing pipelines from environment."""
+        value = os.environ.get("KB_LLM_MAX_CONCURRENCY", "")
+        if value:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                logger.warning(f"Invalid KB_LLM_MAX_CONCURRENCY: {value}")
+        return 5
+
     def _is_authorized(self, user_id: int) -> bool:
         """Check if user is authorized to use the bot."""
         if self.admin_user_id is None:
@@ -78,6 +266,9 @@ class KBBot:
 
     async def initialize(self) -> bool:
         """Initialize bot services."""
+        # Created here so it binds to the running event loop
+        self._pipeline_semaphore = asyncio.Semaphore(self.max_concurrency)
+
         # Initialize LLM
         try:
             self.llm = create_llm(self.config)
@@ -104,7 +295,9 @@ class KBBot:
             .build()
         )
 
-        # Add handlers
+        # Add handlers - the gate in group -1 rejects unauthorized users
+        # before any filters or handlers run
+        self.application.add_handler(TypeHandler(Update, self._reject_unauthorized), group=-1)
         self.application.add_handler(CommandHandler("start", self.cmd_start))
         self.application.add_handler(CommandHandler("help", self.cmd_help))
         self.application.add_handler(CommandHandler("mode", self.cmd_mode))
@@ -116,76 +309,49 @@ class KBBot:
 
         return True
 
-    async def cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /start command."""
+    async def _reject_unauthorized(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Stop processing updates from unauthorized users."""
         user = update.effective_user
+        if user is not None and self._is_authorized(user.id):
+            return
 
-        if not self._is_authorized(user.id):
+        if update.message:
             await update.message.reply_text("⛔ 你没有权限使用此 Bot")
-            return
+        raise ApplicationHandlerStop
 
-        mode_text = "🚀 直接发布" if self.auto_publish else "👀 预览确认"
+    def _mode_text(self) -> str:
+        """Get display text for the current publish mode."""
+        return _MODE_AUTO_TEXT if self.auto_publish else _MODE_PREVIEW_TEXT
+
+    async def cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /start command."""
+        user = update.effective_user
         await update.message.reply_text(
-            f"👋 你好 {user.first_name}!\n\n"
-            f"发送链接给我，我会自动解析并发布到频道。\n\n"
-            f"当前模式: {mode_text}\n\n"
-            f"命令:\n"
-            f"/mode - 切换发布模式\n"
-            f"/cancel - 取消当前操作\n"
-            f"/help - 帮助信息"
+            _START_TEMPLATE.format(name=user.first_name, mode=self._mode_text())
         )
 
     async def cmd_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("⛔ 你没有权限使用此 Bot")
-            return
-
-        await update.message.reply_text(
-            "📖 使用说明\n\n"
-            "1. 直接发送链接\n"
-            "2. 等待解析和摘要生成\n"
-            "3. 选择标签（点击按钮）\n"
-            "4. 确认发布\n\n"
-            "支持的链接类型:\n"
-            "• 普通网页\n"
-            "• ArXiv 论文\n"
-            "• 微信公众号文章\n"
-            "• 知乎（受限）\n\n"
-            "命令:\n"
-            "/mode - 切换直接发布/预览确认模式\n"
-            "/cancel - 取消当前操作"
-        )
+        await update.message.reply_text(_HELP_TEXT)
 
     async def cmd_mode(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Toggle publish mode."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("⛔ 你没有权限使用此 Bot")
-            return
-
         self.auto_publish = not self.auto_publish
-        mode_text = "🚀 直接发布" if self.auto_publish else "👀 预览确认"
-        await update.message.reply_text(f"已切换到: {mode_text}")
+        await update.message.reply_text(f"已切换到: {self._mode_text()}")
 
     async def cmd_cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel current operation."""
         chat_id = update.effective_chat.id
-        if chat_id in self.pending:
-            del self.pending[chat_id]
+        if self.pending.pop(chat_id) is not None:
             await update.message.reply_text("✅ 已取消")
         else:
             await update.message.reply_text("没有进行中的操作")
 
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle text messages (links)."""
-        user = update.effective_user
         chat_id = update.effective_chat.id
         text = update.message.text.strip()
 
-        if not self._is_authorized(user.id):
-            await update.message.reply_text("⛔ 你没有权限使用此 Bot")
-            return
-
         # Extract URLs from message
         urls = extract_urls(text)
         if not urls:
@@ -207,48 +373,31 @@ class KBBot:
         status_msg = await update.message.reply_text("⏳ 正在解析...")
 
         try:
-            # Process content
-            content = await detect_and_process(input_to_process)
-
-            await status_msg.edit_text("⏳ 正在生成摘要...")
-
-            # Generate bilingual summary
-            original_title = content.title
-            if self.llm and content.content:
+            # Reuse results for recently seen URLs (e.g. forwarded duplicates)
+            cache_key = normalize_url(urls[0]) if len(urls) == 1 else None
+            cached = self._url_cache.get(cache_key) if cache_key else None
+            if cached:
+                cached_content, cached_suggested, cached_extra = cached
+                content = replace(cached_content, tags=[])
+                suggested_tags = list(cached_suggested)
+                extra_tags = list(cached_extra)
+            else:
+                # Progress is shown by a background task so status edits
+                # stay off the critical path
+                status = {"text": status_msg.text}
+                status_task = asyncio.create_task(self._status_updater(status_msg, status))
                 try:
-                    bilingual = await self.llm.summarize_bilingual(
-                        content.content,
-                        original_title=original_title
+                    content, suggested_tags, extra_tags = await self._process_and_tag(
+                        input_to_process, status
                     )
-                    if bilingual.get("title_cn"):
-                        content.title = bilingual["title_cn"]
-                    content.summary = bilingual.get("summary_cn", "")
-                    content.title_en = bilingual.get("title_en") or original_title
-                    content.summary_en = bilingual.get("summary_en", "")
-                except Exception as e:
-                    logger.warning(f"Summary generation failed: {e}")
-
-            await status_msg.edit_text("⏳ 正在分析标签...")
-
-            # Get tag suggestions
-            suggested_tags = []
-            extra_tags = []
-
-            if self.llm and content.content:
-                try:
-                    suggested_tags = await self.tagger.suggest_tags(content.content)
-                    extra_tags = await self.tagger.generate_extra_tags(content.content)
-                except Exception:
-                    pass
-
-            # Fallback to title-based tags
-            if self.llm and not suggested_tags:
-                try:
-                    suggested_tags, extra_tags = await self.tagger.generate_tags_from_title(
-                        content.title, content.source
+                finally:
+                    status_task.cancel()
+                # Only complete results are cached; a failed summary or tag
+                # call may be transient and would otherwise stick for the TTL
+                if cache_key and content.summary and suggested_tags and extra_tags:
+                    self._url_cache[cache_key] = (
+                        replace(content), tuple(suggested_tags), tuple(extra_tags)
                     )
-                except Exception:
-                    pass
 
             # Delete status message
             await status_msg.delete()
@@ -266,6 +415,9 @@ class KBBot:
                 suggested_tags=suggested_tags,
                 extra_tags=extra_tags,
                 selected_tags=set(all_tags),  # Pre-select all suggested tags
+                ordered_tags=_order_tags(
+                    suggested_tags, extra_tags, self.tagger.preset_tags, self.tagger.preset_tags_set
+                ),
             )
             self.pending[chat_id] = pending
 
@@ -276,6 +428,133 @@ class KBBot:
             logger.error(f"Processing error: {e}")
             await status_msg.edit_text(f"❌ 处理失败: {e}")
 
+    async def _process_and_tag(
+        self, input_str: str, status: dict
+    ) -> tuple[ProcessedContent, list[str], list[str]]:
+        """Process input, then generate its bilingual summary and tags.
+
+        Progress is reported by writing to status["text"].
+
+        Returns:
+            Tuple of (content, suggested_tags, extra_tags)
+        """
+        # Bound concurrent pipelines so message bursts don't flood the LLM provider
+        async with self._pipeline_semaphore:
+            # Speculatively start title-based tagging from the URL slug so the
+            # tag LLM call overlaps the page fetch
+            title_hint = _title_hint_from_url(input_str)
+            speculative_tags = None
+            if self.llm and title_hint:
+                speculative_tags = asyncio.create_task(
+                    self.tagger.generate_tags_from_title(title_hint, input_str)
+                )
+
+            try:
+                # Process content
+                content = await detect_and_process(input_str)
+            except Exception:
+                if speculative_tags is not None:
+                    speculative_tags.cancel()
+                raise
+
+            # Keep the speculative tags only if the URL slug matched the real
+            # title; they then replace the content-based tag calls
+            original_title = content.title
+            if speculative_tags is not None and not _titles_match(title_hint, original_title):
+                speculative_tags.cancel()
+                speculative_tags = None
+
+            # Get tag suggestions
+            suggested_tags = []
+            extra_tags = []
+
+            # Generate bilingual summary and tags concurrently - each is an
+            # independent LLM round-trip, so total latency is the slowest one
+            if self.llm and content.content:
+                status["text"] = "⏳ 正在生成摘要和标签..."
+                # Slice once; the prompt's own slice is then a no-op copy.
+                # Tag prompts are cut to their token budget by the tagger.
+                summary_text = content.content[:SUMMARY_CONTENT_LIMIT]
+                # Summary replies are cached by the LLM response cache
+                summary_call = self._call_with_backoff(
+                    lambda: self.llm.summarize_bilingual(
+                        summary_text,
+                        original_title=original_title
+                    )
+                )
+                if speculative_tags is not None:
+                    bilingual, title_tags = await asyncio.gather(
+                        summary_call, speculative_tags, return_exceptions=True
+                    )
+                    if not isinstance(title_tags, Exception):
+                        suggested_tags, extra_tags = title_tags
+                    else:
+                        # Speculation failed: tag from the content instead
+                        speculative_tags = None
+                        suggested_tags, extra_tags = await self.tagger.suggest_all(content.content)
+                else:
+                    # Tag replies are cached by the LLM response cache
+                    bilingual, content_tags = await asyncio.gather(
+                        summary_call,
+                        self.tagger.suggest_all(content.content),
+                        return_exceptions=True,
+                    )
+                    if not isinstance(content_tags, Exception):
+                        suggested_tags, extra_tags = content_tags
+
+                if isinstance(bilingual, Exception):
+                    logger.warning(f"Summary generation failed: {bilingual}")
+                else:
+                    if bilingual.get("title_cn"):
+                        content.title = bilingual["title_cn"]
+                    content.summary = bilingual.get("summary_cn", "")
+                    content.title_en = bilingual.get("title_en") or original_title
+                    content.summary_en = bilingual.get("summary_en", "")
+            elif speculative_tags is not None:
+                try:
+                    suggested_tags, extra_tags = await speculative_tags
+                except Exception:
+                    # Let the title fallback below retry with the real title
+                    speculative_tags = None
+
+            # Fallback to title-based tags (already tried when speculating)
+            if self.llm and not suggested_tags and speculative_tags is None:
+                status["text"] = "⏳ 正在根据标题生成标签..."
+                try:
+                    suggested_tags, extra_tags = await self.tagger.generate_tags_from_title(
+                        content.title, content.source
+                    )
+                except Exception:
+                    pass
+
+        return content, suggested_tags, extra_tags
+
+    async def _status_updater(self, status_msg, status: dict, interval: float = 2.0):
+        """Mirror status["text"] into the status message, editing at most once per interval."""
+        shown = status["text"]
+        while True:
+            await asyncio.sleep(interval)
+            text = status["text"]
+            if text == shown:
+                continue
+            try:
+                await status_msg.edit_text(text)
+            except Exception as e:
+                logger.debug(f"Status update failed: {e}")
+            shown = text
+
+    async def _call_with_backoff(self, call, max_retries: int = 3):
+        """Call an LLM coroutine factory, backing off exponentially on rate limits."""
+        for attempt in range(max_retries):
+            try:
+                return await call()
+            except Exception as e:
+                if not is_rate_limited(str(e)) or attempt == max_retries - 1:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"LLM rate limited, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
     async def _show_preview(self, update: Update, pending: PendingContent):
         """Show content preview with tag selection buttons."""
         content = pending.content
@@ -323,50 +602,10 @@ class KBBot:
 
     def _create_tag_keyboard(self, pending: PendingContent) -> InlineKeyboardMarkup:
         """Create inline keyboard for tag selection."""
-        keyboard = []
-
-        # Combine all tags (preset suggestions + extra)
-        all_tags = []
-
-        # Add preset tags that are suggested
-        for tag in pending.suggested_tags:
-            if tag in self.tagger.preset_tags:
-                all_tags.append(tag)
-
-        # Add extra generated tags
-        all_tags.extend(pending.extra_tags)
-
-        # Add remaining preset tags
-        for tag in self.tagger.preset_tags:
-            if tag not in all_tags:
-                all_tags.append(tag)
-
-        # Create tag buttons (3 per row)
-        row = []
-        for tag in all_tags[:12]:  # Limit to 12 tags
-            is_selected = tag in pending.selected_tags
-            button_text = f"✓ {tag}" if is_selected else tag
-            row.append(InlineKeyboardButton(button_text, callback_data=f"tag:{tag}"))
-
-            if len(row) == 3:
-                keyboard.append(row)
-                row = []
-
-        if row:
-            keyboard.append(row)
-
-        # Add action buttons
-        selected_count = len(pending.selected_tags)
-        keyboard.append([
-            InlineKeyboardButton("🔄 清空", callback_data="clear"),
-            InlineKeyboardButton("✅ 全选", callback_data="select_all"),
-        ])
-        keyboard.append([
-            InlineKeyboardButton(f"📤 发布 ({selected_count})", callback_data="publish"),
-            InlineKeyboardButton("❌ 取消", callback_data="cancel"),
-        ])
-
-        return InlineKeyboardMarkup(keyboard)
+        return _build_tag_keyboard(
+            tuple(pending.ordered_tags[:12]),  # Limit to 12 tags
+            frozenset(pending.selected_tags),
+        )
 
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle callback queries from inline buttons."""
@@ -374,10 +613,6 @@ class KBBot:
         await query.answer()
 
         chat_id = update.effective_chat.id
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            return
 
         pending = self.pending.get(chat_id)
         if not pending:
@@ -394,9 +629,11 @@ class KBBot:
             else:
                 pending.selected_tags.add(tag)
 
-            # Update keyboard
-            keyboard = self._create_tag_keyboard(pending)
-            await query.edit_message_reply_markup(reply_markup=keyboard)
+            # Update keyboard - rapid taps are coalesced into one edit
+            if pending.edit_task is None:
+                pending.edit_task = asyncio.create_task(
+                    self._debounced_keyboard_edit(query, chat_id, pending)
+                )
 
         elif data == "clear":
             # Clear all selected tags
@@ -406,25 +643,45 @@ class KBBot:
 
         elif data == "select_all":
             # Select all suggested tags
-            all_tags = pending.suggested_tags + pending.extra_tags
-            for tag in self.tagger.preset_tags[:12]:
-                if tag not in all_tags:
-                    all_tags.append(tag)
-            pending.selected_tags = set(all_tags[:12])
+            all_tags = dict.fromkeys(
+                pending.suggested_tags + pending.extra_tags + list(self.tagger.preset_tags_top12)
+            )
+            pending.selected_tags = set(list(all_tags)[:12])
             keyboard = self._create_tag_keyboard(pending)
             await query.edit_message_reply_markup(reply_markup=keyboard)
 
         elif data == "publish":
             # Publish with selected tags
             pending.content.tags = list(pending.selected_tags)
-            await self._publish_content_callback(query, pending.content)
-            del self.pending[chat_id]
+            self.pending.pop(chat_id)
+
+            # Publish in the background so a slow upload doesn't hold the handler
+            await query.edit_message_reply_markup(reply_markup=None)
+            self._run_in_background(self._publish_content_callback(query, pending.content))
 
         elif data == "cancel":
             # Cancel operation
-            del self.pending[chat_id]
+            self.pending.pop(chat_id)
             await query.edit_message_text("❌ 已取消")
 
+    async def _debounced_keyboard_edit(
+        self, query, chat_id: int, pending: PendingContent, delay: float = 0.25
+    ):
+        """Edit the tag keyboard once after a short delay, covering all taps in between."""
+        await asyncio.sleep(delay)
+        pending.edit_task = None
+
+        # Skip if the content was published or cancelled meanwhile
+        if self.pending.get(chat_id) is not pending:
+            return
+
+        keyboard = self._create_tag_keyboard(pending)
+        try:
+            await query.edit_message_reply_markup(reply_markup=keyboard)
+        except Exception as e:
+            # e.g. "message is not modified" when a tag was toggled twice
+            logger.debug(f"Keyboard edit skipped: {e}")
+
     async def _publish_content(self, update: Update, content: ProcessedContent):
         """Publish content to channel."""
         try:
@@ -440,6 +697,13 @@ class KBBot:
             logger.error(f"Publish error: {e}")
             await update.message.reply_text(f"❌ 发布失败: {e}")
 
+    def _run_in_background(self, coro) -> asyncio.Task:
+        """Schedule a coroutine without awaiting it, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
     async def _publish_content_callback(self, query, content: ProcessedContent):
         """Publish content from callback query."""
         try:
@@ -457,12 +721,7 @@ class KBBot:
 
     def _escape_md(self, text: str) -> str:
         """Escape markdown special characters."""
-        if not text:
-            return ""
-        # Only escape characters that need escaping in Markdown V1
-        for char in ['_', '*', '[', ']', '`']:
-            text = text.replace(char, f'\\{char}')
-        return text
+        return text.translate(_MD_ESCAPE) if text else ""
 
     async def run(self):
         """Run the bot."""
@@ -480,20 +739,50 @@ class KBBot:
 
         await self.application.initialize()
         await self.application.start()
-        await self.application.updater.start_polling(drop_pending_updates=True)
+
+        if self.webhook_url:
+            # Webhook mode: Telegram pushes updates, no polling round-trips
+            await self.application.updater.start_webhook(
+                listen="0.0.0.0",
+                port=self.webhook_port,
+                url_path=urlparse(self.webhook_url).path.lstrip("/"),
+                webhook_url=self.webhook_url,
+                secret_token=self.webhook_secret or None,
+                drop_pending_updates=True,
+            )
+            logger.info(f"Webhook listening on port {self.webhook_port}")
+        else:
+            await self.application.updater.start_polling(drop_pending_updates=True)
 
         logger.info("Bot is running. Press Ctrl+C to stop.")
 
-        # Keep running until interrupted
+        # Wait for a stop signal instead of waking up every second
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        installed_signals = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+                installed_signals.append(sig)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on Windows, fall back to KeyboardInterrupt
+                pass
+
         try:
-            while True:
-                await asyncio.sleep(1)
+            await stop_event.wait()
         except asyncio.CancelledError:
             pass
         finally:
+            # Restore default handlers so a second Ctrl+C still interrupts shutdown
+            for sig in installed_signals:
+                loop.remove_signal_handler(sig)
             await self.application.updater.stop()
             await self.application.stop()
             await self.application.shutdown()
+            if self.llm:
+                await self.llm.aclose()
+            await close_http_client()
+            logger.info("Bot stopped.")
 
 
 def run_bot():
@@ -513,7 +802,7 @@ def run_bot():
     bot = KBBot(config)
 
     try:
-        asyncio.run(bot.run())
+        run_async(bot.run())
     except KeyboardInterrupt:
         print("\nBot stopped.")
 
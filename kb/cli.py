@@ -7,24 +7,37 @@ warnings.filterwarnings("ignore")
 
 import asyncio
 import sys
-from typing import Optional
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
+from typing import TYPE_CHECKING, Optional, Union
 
 from .config import load_config, get_config_path, Config
-from .llm import create_llm, BaseLLM
-from .processors import detect_and_process, extract_urls, ProcessedContent, UnsupportedFileError
+from .llm import create_llm, BaseLLM, SUMMARY_CONTENT_LIMIT
+from .processors import (
+    close_http_client, detect_and_process, detect_and_process_many, extract_urls,
+    ProcessedContent, UnsupportedFileError,
+)
 from .tagger import Tagger
 from .publisher import TelegramPublisher
+from .util import run_async, to_thread_fast
+
+# rich and prompt_toolkit are imported on first use to keep `import kb.cli` cheap
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from rich.console import Console
+
+
+class _LazyConsole:
+    """Proxy that creates the rich Console on first use."""
+
+    _console: Optional[Console] = None
+
+    def __getattr__(self, name: str):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
 
 
-console = Console()
+console = _LazyConsole()
 
 
 # ASCII Art Logo - Gemini style: Blue → Purple → Pink gradient
@@ -59,6 +72,7 @@ class KBApp:
         self.tagger: Optional[Tagger] = None
         self.publisher: Optional[TelegramPublisher] = None
         self.session: Optional[PromptSession] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
 
     def initialize(self) -> bool:
         """Initialize the application."""
@@ -85,6 +99,10 @@ class KBApp:
             console.print("[yellow]⚠ Telegram 未配置[/yellow]")
 
         # Initialize prompt session
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+
         self.session = PromptSession(
             history=FileHistory(get_history_path()),
             auto_suggest=AutoSuggestFromHistory(),
@@ -123,8 +141,18 @@ class KBApp:
         """Async prompt wrapper."""
         return await self.session.prompt_async(message, default=default)
 
+    async def _prewarm(self):
+        """Open the LLM connection in the background so the first input doesn't pay the TLS handshake."""
+        if not self.llm:
+            return
+        try:
+            await self.llm.warmup()
+        except Exception:
+            pass  # Warm-up is best effort; real calls report their own errors
+
     async def run_interactive(self):
         """Run the interactive CLI loop."""
+        self._prewarm_task = asyncio.create_task(self._prewarm())
         self.show_welcome()
 
         while True:
@@ -156,18 +184,30 @@ class KBApp:
             except EOFError:
                 break
 
+        # Don't let a pending warm-up race the client shutdown
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+            await asyncio.gather(self._prewarm_task, return_exceptions=True)
+        if self.llm:
+            await self.llm.aclose()
+        await close_http_client()
+
     async def handle_multiple_urls(self, original_input: str, urls: list[str]):
         """Handle input containing multiple URLs."""
-        console.print()
-        console.print(f"[yellow]检测到 {len(urls)} 个链接：[/yellow]")
-        for i, url in enumerate(urls, 1):
-            console.print(f"  [dim]{i}.[/dim] {url[:60]}{'...' if len(url) > 60 else ''}")
-
-        console.print()
-        console.print("[bold]如何处理？[/bold]")
-        console.print("  [cyan]1[/cyan] 合并为一条消息")
-        console.print("  [cyan]2[/cyan] 分别发布多条消息")
-        console.print("  [cyan]3[/cyan] 取消")
+        # Build the whole menu and render it in one print call
+        lines = ["", f"[yellow]检测到 {len(urls)} 个链接：[/yellow]"]
+        lines.extend(
+            f"  [dim]{i}.[/dim] {url[:60]}{'...' if len(url) > 60 else ''}"
+            for i, url in enumerate(urls, 1)
+        )
+        lines.extend([
+            "",
+            "[bold]如何处理？[/bold]",
+            "  [cyan]1[/cyan] 合并为一条消息",
+            "  [cyan]2[/cyan] 分别发布多条消息",
+            "  [cyan]3[/cyan] 取消",
+        ])
+        console.print("\n".join(lines))
 
         choice = await self.prompt_async("  选择 (1/2/3): ", default="1")
         choice = choice.strip()
@@ -176,10 +216,12 @@ class KBApp:
             # Process as single message with all URLs
             await self.process_input(original_input)
         elif choice == "2":
-            # Process each URL separately
-            for i, url in enumerate(urls, 1):
+            # Fetch all pages concurrently up front, then review each in turn
+            with console.status(f"[bold blue]正在解析 {len(urls)} 个链接...[/bold blue]"):
+                results = await detect_and_process_many(urls)
+            for i, (url, result) in enumerate(zip(urls, results), 1):
                 console.print(f"\n[bold cyan]处理链接 {i}/{len(urls)}[/bold cyan]")
-                await self.process_input(url)
+                await self.process_input(url, prefetched=result)
                 if i < len(urls):
                     cont = await self.prompt_async("继续下一个？(Y/n): ", default="y")
                     if cont.strip().lower() not in ("", "y", "yes"):
@@ -188,54 +230,84 @@ class KBApp:
         else:
             console.print("[dim]已取消[/dim]")
 
-    async def process_input(self, user_input: str):
-        """Process a single input."""
+    async def process_input(
+        self,
+        user_input: str,
+        prefetched: Optional[Union[ProcessedContent, Exception]] = None
+    ):
+        """Process a single input.
+
+        Args:
+            user_input: URL, file path, or text
+            prefetched: Result of an earlier detect_and_process_many for this input
+        """
         console.print()
 
-        with console.status("[bold blue]正在解析...[/bold blue]"):
-            try:
-                content = await detect_and_process(user_input)
-            except UnsupportedFileError as e:
-                console.print(f"[red]✗ {e}[/red]")
-                console.print("[dim]提示: 目前只支持 PDF 和图片文件[/dim]")
-                return
-            except Exception as e:
-                console.print(f"[red]✗ 解析失败: {e}[/red]")
-                return
-
-        # Generate bilingual summary
-        summary_failed = False
-        original_title = content.title  # Save original title for translation
-        if self.llm and content.content:
-            with console.status("[bold blue]正在生成双语摘要...[/bold blue]"):
-                try:
-                    bilingual = await self.llm.summarize_bilingual(
-                        content.content,
-                        original_title=original_title
-                    )
-                    if bilingual.get("title_cn"):
-                        content.title = bilingual["title_cn"]
-                    content.summary = bilingual.get("summary_cn", "")
-                    content.title_en = bilingual.get("title_en") or original_title
-                    content.summary_en = bilingual.get("summary_en", "")
-                except Exception as e:
-                    summary_failed = True
-                    console.print(f"[yellow]⚠ 摘要失败: {e}[/yellow]")
-
-        self._display_preview(content)
+        try:
+            if isinstance(prefetched, Exception):
+                raise prefetched
+            if prefetched is not None:
+                content = prefetched
+            else:
+                with console.status("[bold blue]正在解析...[/bold blue]"):
+                    content = await detect_and_process(user_input)
+        except UnsupportedFileError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            console.print("[dim]提示: 目前只支持 PDF 和图片文件[/dim]")
+            return
+        except Exception as e:
+            console.print(f"[red]✗ 解析失败: {e}[/red]")
+            return
 
-        # Get tag suggestions
+        # Generate bilingual summary and tags concurrently
+        original_title = content.title  # Save original title for translation
         suggested_tags = []
         extra_tags = []
+        if self.llm and content.content:
+            from rich.live import Live
+            from rich.panel import Panel
+            from rich.text import Text
+
+            # Stream the summary into a live panel while tags are generated
+            streamed = Text()
+            with Live(
+                "[bold blue]正在分析内容...[/bold blue]",
+                console=console,
+                refresh_per_second=8,
+                transient=True,
+            ) as live:
+                def on_text(delta: str) -> None:
+                    # Append only the new piece; Live re-renders at its own rate
+                    streamed.append(delta)
+                    live.update(Panel(streamed, title="正在生成摘要...", border_style="blue"))
+
+                # Slice once; the prompt's own slice is then a no-op copy.
+                # Tag prompts are cut to their token budget by the tagger.
+                summary_text = content.content[:SUMMARY_CONTENT_LIMIT]
+                bilingual, content_tags = await asyncio.gather(
+                    self.llm.summarize_bilingual(
+                        summary_text,
+                        original_title=original_title,
+                        on_text=on_text
+                    ),
+                    self.tagger.suggest_all(content.content),
+                    return_exceptions=True,
+                )
+
+            if isinstance(bilingual, Exception):
+                console.print(f"[yellow]⚠ 摘要失败: {bilingual}[/yellow]")
+            else:
+                if bilingual.get("title_cn"):
+                    content.title = bilingual["title_cn"]
+                content.summary = bilingual.get("summary_cn", "")
+                content.title_en = bilingual.get("title_en") or original_title
+                content.summary_en = bilingual.get("summary_en", "")
 
-        # If content available and summary succeeded, use full content for tags
-        if self.llm and content.content and not summary_failed:
-            with console.status("[bold blue]正在分析标签...[/bold blue]"):
-                try:
-                    suggested_tags = await self.tagger.suggest_tags(content.content)
-                    extra_tags = await self.tagger.generate_extra_tags(content.content)
-                except Exception:
-                    pass
+                # Only trust content-based tags if the summary succeeded
+                if not isinstance(content_tags, Exception):
+                    suggested_tags, extra_tags = content_tags
+
+        self._display_preview(content)
 
         # Fallback: generate tags from title if no tags yet
         if self.llm and not suggested_tags:
@@ -260,7 +332,8 @@ class KBApp:
 
         if tag_input:
             user_tags = self.tagger.parse_user_input(tag_input)
-            content.tags = self.tagger.process_tags(user_tags)
+            # New tags are saved to the config file - keep that off the event loop
+            content.tags = await to_thread_fast(self.tagger.process_tags, user_tags)
         else:
             content.tags = all_suggested
 
@@ -312,6 +385,8 @@ class KBApp:
         if content.source and content.source != "text":
             lines.append(f"[dim]🔗 {content.source}[/dim]")
 
+        from rich.panel import Panel
+
         panel = Panel(
             "\n".join(lines),
             border_style="blue",
@@ -323,28 +398,27 @@ class KBApp:
 
     def _display_tag_selection(self, suggested: list[str], extra: list[str]):
         """Display tag selection interface."""
-        console.print("[bold]🏷️  标签[/bold]")
-
-        # Preset tags
-        preset_display = []
-        for tag in self.tagger.preset_tags:
-            if tag in suggested:
-                preset_display.append(f"[bold green][{tag}][/bold green]")
-            else:
-                preset_display.append(f"[dim]{tag}[/dim]")
-        console.print(f"  预设: {' '.join(preset_display)}")
+        suggested_set = set(suggested)
+        preset_display = " ".join(
+            f"[bold green][{tag}][/bold green]" if tag in suggested_set else f"[dim]{tag}[/dim]"
+            for tag in self.tagger.preset_tags
+        )
+        lines = ["[bold]🏷️  标签[/bold]", f"  预设: {preset_display}"]
 
         # LLM generated extra tags
         if extra:
             extra_display = " ".join(f"[cyan]+{tag}[/cyan]" for tag in extra)
-            console.print(f"  新增: {extra_display}")
+            lines.append(f"  新增: {extra_display}")
 
-        console.print()
+        lines.append("")
+        console.print("\n".join(lines))
 
     def _show_formatted_output(self, content: ProcessedContent):
         """Show the formatted output."""
         console.print()
         console.print("[bold]预览输出:[/bold]")
+
+        from rich.panel import Panel
         console.print(Panel(content.format_for_telegram(), border_style="dim"))
 
 
@@ -359,7 +433,7 @@ def main():
         sys.exit(1)
 
     try:
-        asyncio.run(app.run_interactive())
+        run_async(app.run_interactive(), eager_tasks=True)
     except KeyboardInterrupt:
         console.print("\n[dim]再见！[/dim]")
 
@@ -1,7 +1,9 @@
 """Configuration management for KB-CLI."""
 from __future__ import annotations
 
+import hashlib
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -10,13 +12,22 @@ from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
+from .util import json_dumps, json_loads
 
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+
+@lru_cache(maxsize=1)
 def _find_project_root() -> Optional[Path]:
     """Find project root by looking for .env or pyproject.toml."""
     # Start from current working directory
     current = Path.cwd()
     for _ in range(10):  # Max 10 levels up
-        if (current / ".env").exists() or (current / "pyproject.toml").exists():
+        if (current / ".env").is_file() or (current / "pyproject.toml").is_file():
             return current
         parent = current.parent
         if parent == current:
@@ -25,24 +36,28 @@ def _find_project_root() -> Optional[Path]:
     return None
 
 
+_ENV_LOADED = False
+
+
 def _load_dotenv_files():
     """Load .env files from project directory and home config."""
-    # Try to find project root
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    _ENV_LOADED = True
+
+    # In priority order: project root, current directory, home config (lowest).
+    # Earlier files win since later ones don't override.
+    candidates = []
     project_root = _find_project_root()
     if project_root:
-        env_file = project_root / ".env"
-        if env_file.exists():
-            load_dotenv(env_file)
+        candidates.append(project_root / ".env")
+    candidates.append(Path.cwd() / ".env")
+    candidates.append(Path.home() / ".kb" / ".env")
 
-    # Also try current working directory
-    cwd_env = Path.cwd() / ".env"
-    if cwd_env.exists():
-        load_dotenv(cwd_env, override=False)
-
-    # Load from home config directory (lowest priority)
-    home_env = Path.home() / ".kb" / ".env"
-    if home_env.exists():
-        load_dotenv(home_env, override=False)
+    for env_file in dict.fromkeys(candidates):
+        if env_file.is_file():
+            load_dotenv(env_file, override=False)
 
 
 # Load .env on module import
@@ -63,6 +78,12 @@ class LLMProviderConfig(BaseModel):
     enabled: bool = True
 
 
+class SemanticCacheConfig(BaseModel):
+    """Near-duplicate LLM response cache (needs sentence-transformers)."""
+    enabled: bool = False
+    threshold: float = 0.92
+
+
 class LLMConfig(BaseModel):
     """LLM configuration supporting multiple providers."""
     default_provider: str = "openai"
@@ -94,6 +115,8 @@ class LLMConfig(BaseModel):
         model="glm-4-flash"
     ))
 
+    semantic_cache: SemanticCacheConfig = Field(default_factory=SemanticCacheConfig)
+
 
 class TagConfig(BaseModel):
     """Tag configuration."""
@@ -102,6 +125,12 @@ class TagConfig(BaseModel):
         "Research", "Programming", "Product", "Design"
     ])
     allow_new: bool = True
+    # Token budget for content in tag prompts (used when tiktoken is installed)
+    max_prompt_tokens: int = 1500
+    # Distinct preset tags found verbatim (exact spelling) in content that
+    # make an LLM suggestion unnecessary. Off by default: generic presets
+    # like "Tools" or "Design" show up in ordinary prose. 0 disables it.
+    literal_match_threshold: int = 0
 
 
 class Config(BaseModel):
@@ -123,8 +152,22 @@ def get_config_path() -> Path:
     return get_config_dir() / "config.yaml"
 
 
+def get_config_cache_path() -> Path:
+    """Get the path of the parsed-config cache kept next to config.yaml."""
+    return get_config_dir() / "config.cache.json"
+
+
+# Parsed config cache: (config file mtime_ns, config)
+_CONFIG_CACHE: Optional[tuple[int, Config]] = None
+
+
 def load_config() -> Config:
-    """Load configuration from file."""
+    """Load configuration from file.
+
+    The parsed config is cached in-process and reused until the file's
+    mtime changes.
+    """
+    global _CONFIG_CACHE
     config_path = get_config_path()
 
     if not config_path.exists():
@@ -133,52 +176,95 @@ def load_config() -> Config:
         save_config(config)
         return config
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    mtime_ns = config_path.stat().st_mtime_ns
+    if _CONFIG_CACHE is not None and _CONFIG_CACHE[0] == mtime_ns:
+        # Hand out a copy so callers can't mutate the cached config
+        return _CONFIG_CACHE[1].model_copy(deep=True)
+
+    data = _load_config_data(config_path)
 
     # Override with environment variables
     _override_from_env(data)
 
-    return Config(**data)
+    config = Config(**data)
+    _CONFIG_CACHE = (mtime_ns, config.model_copy(deep=True))
+    return config
+
+
+def _load_config_data(config_path: Path) -> dict:
+    """Parse config.yaml, reusing the JSON cache from a previous run.
+
+    The cache holds the raw YAML data (before env overrides) keyed by a
+    hash of the file bytes, so later CLI starts skip YAML parsing.
+    """
+    raw = config_path.read_bytes()
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    cache_path = get_config_cache_path()
+
+    try:
+        cached = json_loads(cache_path.read_bytes())
+        if cached.get("hash") == digest:
+            return cached["data"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    data = yaml.load(raw, Loader=_YamlLoader) or {}
+
+    # Write atomically so a concurrent reader never sees a partial file
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        tmp_path.write_bytes(json_dumps({"hash": digest, "data": data}))
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass  # Cache is optional (e.g. read-only home or non-JSON values)
+
+    return data
 
 
 def save_config(config: Config) -> None:
     """Save configuration to file."""
+    global _CONFIG_CACHE
     config_path = get_config_path()
 
     with open(config_path, "w", encoding="utf-8") as f:
         yaml.dump(
             config.model_dump(),
             f,
+            Dumper=_YamlDumper,
             default_flow_style=False,
             allow_unicode=True,
             sort_keys=False
         )
 
+    # Force a re-parse so env overrides are applied on top of the new file
+    _CONFIG_CACHE = None
+    get_config_cache_path().unlink(missing_ok=True)
+
+
+# Environment variable -> config path, applied on top of config.yaml
+_ENV_MAPPINGS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("KB_TELEGRAM_BOT_TOKEN", ("telegram", "bot_token")),
+    ("KB_TELEGRAM_CHANNEL_ID", ("telegram", "channel_id")),
+    ("KB_LLM_PROVIDER", ("llm", "default_provider")),
+    ("OPENAI_API_KEY", ("llm", "openai", "api_key")),
+    ("ANTHROPIC_API_KEY", ("llm", "anthropic", "api_key")),
+    ("GEMINI_API_KEY", ("llm", "gemini", "api_key")),
+    ("DEEPSEEK_API_KEY", ("llm", "deepseek", "api_key")),
+    ("KIMI_API_KEY", ("llm", "kimi", "api_key")),
+    ("MINIMAX_API_KEY", ("llm", "minimax", "api_key")),
+    ("GLM_API_KEY", ("llm", "glm", "api_key")),
+)
+
 
 def _override_from_env(data: dict) -> None:
     """Override config values from environment variables."""
-    env_mappings = {
-        "KB_TELEGRAM_BOT_TOKEN": ("telegram", "bot_token"),
-        "KB_TELEGRAM_CHANNEL_ID": ("telegram", "channel_id"),
-        "KB_LLM_PROVIDER": ("llm", "default_provider"),
-        "OPENAI_API_KEY": ("llm", "openai", "api_key"),
-        "ANTHROPIC_API_KEY": ("llm", "anthropic", "api_key"),
-        "GEMINI_API_KEY": ("llm", "gemini", "api_key"),
-        "DEEPSEEK_API_KEY": ("llm", "deepseek", "api_key"),
-        "KIMI_API_KEY": ("llm", "kimi", "api_key"),
-        "MINIMAX_API_KEY": ("llm", "minimax", "api_key"),
-        "GLM_API_KEY": ("llm", "glm", "api_key"),
-    }
-
-    for env_var, path in env_mappings.items():
-        value = os.environ.get(env_var)
-        if value:
+    environ = os.environ
+    for env_var, path in _ENV_MAPPINGS:
+        if value := environ.get(env_var):
             _set_nested(data, path, value)
 
     # Handle preset tags (comma-separated list)
-    preset_tags = os.environ.get("KB_PRESET_TAGS")
-    if preset_tags:
+    if preset_tags := environ.get("KB_PRESET_TAGS"):
         tags = [t.strip() for t in preset_tags.split(",") if t.strip()]
         if tags:
             data.setdefault("tags", {})["presets"] = tags
@@ -193,9 +279,16 @@ def _set_nested(data: dict, path: tuple, value: str) -> None:
 
 def add_preset_tag(tag: str) -> None:
     """Add a new preset tag."""
+    add_preset_tags([tag])
+
+
+def add_preset_tags(tags: list[str]) -> None:
+    """Add new preset tags, writing the config file at most once."""
     config = load_config()
-    if tag not in config.tags.presets:
-        config.tags.presets.append(tag)
+    presets = config.tags.presets
+    new_tags = [tag for tag in dict.fromkeys(tags) if tag not in presets]
+    if new_tags:
+        presets.extend(new_tags)
         save_config(config)
 
 
@@ -204,7 +297,7 @@ def get_provider_config(config: Config, provider: Optional[str] = None) -> tuple
     provider = provider or config.llm.default_provider
     provider_config = getattr(config.llm, provider, None)
 
-    if provider_config is None:
+    if not isinstance(provider_config, LLMProviderConfig):
         raise ValueError(f"Unknown LLM provider: {provider}")
 
     return provider, provider_config
@@ -1,6 +1,11 @@
 """LLM adapters for multiple providers."""
 
-from .base import BaseLLM, LLMResponse
+from .base import (
+    BaseLLM, LLMResponse, SUMMARY_CONTENT_LIMIT, TAG_CONTENT_LIMIT, backoff_delay, is_rate_limited,
+)
 from .factory import create_llm
 
-__all__ = ["BaseLLM", "LLMResponse", "create_llm"]
+__all__ = [
+    "BaseLLM", "LLMResponse", "SUMMARY_CONTENT_LIMIT", "TAG_CONTENT_LIMIT",
+    "backoff_delay", "create_llm", "is_rate_limited",
+]
@@ -1,11 +1,14 @@
 """Anthropic Claude LLM adapter."""
 from __future__ import annotations
 
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from anthropic import AsyncAnthropic
 
-from .base import BaseLLM, LLMResponse
+from .base import BaseLLM, LLMResponse, SharedClients, create_http_client
+
+# (base_url, api_key) -> client shared by all adapter instances
+_CLIENTS = SharedClients()
 
 
 class AnthropicLLM(BaseLLM):
@@ -20,13 +23,30 @@ class AnthropicLLM(BaseLLM):
         base_url: Optional[str] = None
     ):
         super().__init__(api_key, model, base_url)
-        self.client = AsyncAnthropic(
+        # Reuse one client (and its connection pool) per endpoint and key
+        self._client_key = (base_url or "", api_key)
+        self._released = False
+        self.client = _CLIENTS.acquire(self._client_key, lambda: AsyncAnthropic(
             api_key=api_key,
-            base_url=base_url
-        )
+            base_url=base_url,
+            http_client=create_http_client()
+        ))
 
-    async def chat(self, messages: list[dict], **kwargs) -> LLMResponse:
-        """Send a chat completion request."""
+    async def aclose(self) -> None:
+        """Release the shared client, closing it once no adapter uses it."""
+        if self._released:
+            return
+        self._released = True
+        client = _CLIENTS.release(self._client_key)
+        if client is not None:
+            await client.close()
+
+    async def warmup(self) -> None:
+        """Open the connection with a models-list request (not billed)."""
+        await self.client.models.list(limit=1)
+
+    def _build_request(self, messages: list[dict], **kwargs) -> dict:
+        """Build Messages API request kwargs from chat messages."""
         # Extract system message if present
         system_message = None
         chat_messages = []
@@ -45,14 +65,27 @@ class AnthropicLLM(BaseLLM):
         }
 
         if system_message:
-            request_kwargs["system"] = system_message
+            # Mark the static system prompt as a cacheable prefix
+            request_kwargs["system"] = [{
+                "type": "text",
+                "text": system_message,
+                "cache_control": {"type": "ephemeral"},
+            }]
+
+        return request_kwargs
 
+    async def chat(self, messages: list[dict], **kwargs) -> LLMResponse:
+        """Send a chat completion request."""
+        request_kwargs = self._build_request(messages, **kwargs)
         response = await self.client.messages.create(**request_kwargs)
 
         usage = {
             "prompt_tokens": response.usage.input_tokens,
             "completion_tokens": response.usage.output_tokens,
             "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
+            # Prompt caching: tokens served from / written to the cache
+            "cache_read_tokens": getattr(response.usage, "cache_read_input_tokens", None) or 0,
+            "cache_write_tokens": getattr(response.usage, "cache_creation_input_tokens", None) or 0,
         }
 
         content = ""
@@ -66,3 +99,10 @@ class AnthropicLLM(BaseLLM):
             provider=self.provider_name,
             usage=usage
         )
+
+    async def chat_stream(self, messages: list[dict], **kwargs) -> AsyncIterator[str]:
+        """Stream a chat completion as text chunks."""
+        request_kwargs = self._build_request(messages, **kwargs)
+        async with self.client.messages.stream(**request_kwargs) as stream:
+            async for text in stream.text_stream:
+                yield text
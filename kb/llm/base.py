@@ -1,9 +1,182 @@
 """Base class for LLM adapters."""
 from __future__ import annotations
 
+import random
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import asdict, dataclass
+from functools import lru_cache, wraps
+from typing import Any, AsyncIterator, Callable, Hashable, Optional
+
+import httpx
+
+from .cache import ResponseCache, SemanticCache, get_response_cache
+
+
+# Matches "标题中文: ..." style lines in bilingual summary responses
+BILINGUAL_FIELD_PATTERN = re.compile(
+    r'^[ \t]*(标题中文|摘要中文|标题英文|摘要英文)[ \t]*[:：][ \t]*(.*?)[ \t\r]*$',
+    re.MULTILINE
+)
+
+BILINGUAL_FIELD_KEYS = {
+    "标题中文": "title_cn",
+    "摘要中文": "summary_cn",
+    "标题英文": "title_en",
+    "摘要英文": "summary_en",
+}
+
+# Markers of rate-limit errors across providers (HTTP 429, Gemini's
+# RESOURCE_EXHAUSTED, "rate limit"/"rate_limit" in SDK messages)
+_RATE_LIMIT_RE = re.compile(r'429|RESOURCE_EXHAUSTED|rate[ _]limit', re.IGNORECASE)
+
+# Normalizes full-width commas in tag lists
+_FULLWIDTH_COMMA = str.maketrans({"，": ","})
+
+# How much content each prompt sees; callers can pre-slice to these limits
+# so the in-method slices are no-op copies
+SUMMARY_CONTENT_LIMIT = 5000
+TAG_CONTENT_LIMIT = 3000
+
+
+# System prompt templates, formatted by the cached helpers below
+SUMMARY_WITH_TITLE_PROMPT = """你是专业翻译。任务：翻译标题+生成摘要。
+
+【必须翻译的原始标题】: {original_title}
+
+【输出格式】:
+标题中文: <在这里写原始标题的完整中文翻译>
+摘要中文: <中文摘要，不超过{max_length}字>
+标题英文: {original_title}
+摘要英文: <English summary, max {max_length} words>
+
+【翻译示例】:
+- "Attention Is All You Need" → "注意力机制是你所需要的一切"
+- "Stabilizing Reinforcement Learning with LLMs: Formulation and Practices" → "稳定大语言模型强化学习：公式化方法与实践"
+- "Chain-of-Thought Prompting Elicits Reasoning" → "思维链提示激发推理能力"
+
+【严格要求】:
+- 中文标题必须翻译原标题的【所有单词】，不能遗漏任何部分
+- 如果原标题是 "A: B" 格式，中文也必须是 "A：B" 格式
+- 英文标题保持原样不变：{original_title}
+- 输出前自检：中文标题字数应不少于英文单词数的 1.5 倍，否则说明有遗漏，请重写后再输出"""
+
+SUMMARY_PROMPT = """你是一个双语内容摘要专家。请为内容生成中英双语的标题和摘要。
+
+输出格式（严格遵守）:
+标题中文: [中文标题，简洁有力，不超过30字]
+摘要中文: [中文摘要，不超过{max_length}字]
+标题英文: [English title, concise and informative]
+摘要英文: [English summary, max {max_length} words]
+
+要求:
+1. 标题要简洁有力，能概括内容核心
+2. 摘要要抓住重点，突出价值和亮点
+3. 中英文内容要对应，但不必是直译
+4. 直接按格式输出，不要有其他内容"""
+
+SUGGEST_TAGS_PROMPT = """你是一个内容分类专家。你的任务是分析内容并从预设标签中选择所有相关的标签。
+
+预设标签列表: [{tags_str}]
+
+分析步骤:
+1. 仔细阅读内容，理解其主题、领域和关键概念
+2. 对照每个预设标签，判断内容是否与该标签相关
+3. 选择所有相关的标签（不限数量，只要相关就选）
+
+标签含义参考:
+- AI: 人工智能相关
+- LLM: 大语言模型相关
+- VLM: 视觉语言模型相关
+- Agent: AI Agent、智能体相关
+- Paper: 学术论文
+- 预训练/后训练: 模型训练相关
+- 强化学习/RL: 强化学习相关
+- 多模态/Multi-modal: 多模态相关
+- Research: 研究相关
+- Tutorial: 教程相关
+- Programming: 编程相关
+- Model: 模型相关
+- Dataset: 数据集相关
+
+输出要求:
+- 只输出标签名，用英文逗号分隔
+- 必须从预设标签中选择，完全匹配（包括大小写）
+- 选择所有相关的标签，不要遗漏
+- 不要输出任何解释"""
+
+TRANSLATE_TITLE_PROMPT = "你是翻译专家。将英文标题翻译为中文，要求完整准确，不遗漏任何单词。只输出翻译结果，不要其他内容。"
+
+
+@lru_cache(maxsize=64)
+def _summary_system_prompt(original_title: str, max_length: int) -> str:
+    """Build the summary system prompt (translating original_title if given)."""
+    if original_title:
+        return SUMMARY_WITH_TITLE_PROMPT.format(original_title=original_title, max_length=max_length)
+    return SUMMARY_PROMPT.format(max_length=max_length)
+
+
+@lru_cache(maxsize=8)
+def _suggest_tags_system_prompt(preset_tags: tuple[str, ...]) -> str:
+    """Build the tag suggestion system prompt; rebuilt only when presets change."""
+    return SUGGEST_TAGS_PROMPT.format(tags_str=", ".join(preset_tags))
+
+
+def backoff_delay(attempt: int, minimum: float = 0.0, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based).
+
+    Sleeps a random time in [0, min(cap, base * 2**attempt)] so concurrent
+    callers don't retry in lockstep, but never less than `minimum` (e.g. a
+    server-provided retry hint).
+    """
+    return max(minimum, random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+def is_rate_limited(error_str: str) -> bool:
+    """Check whether an error message describes a rate limit."""
+    return _RATE_LIMIT_RE.search(error_str) is not None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP/2 client for SDK adapters.
+
+    Concurrent summary and tag calls are multiplexed over one kept-alive
+    connection instead of opening a new one each. Endpoints without HTTP/2
+    keep every pooled connection alive, so a burst of batched tag calls
+    doesn't reconnect on the next burst.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
+
+
+class SharedClients:
+    """SDK clients shared per endpoint, closed when the last adapter releases them."""
+
+    def __init__(self):
+        # key -> [client, number of adapters holding it]
+        self._entries: dict[Hashable, list] = {}
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get the client for key, creating it on first use."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [factory(), 0]
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, key: Hashable) -> Optional[Any]:
+        """Drop one reference; return the client once nobody holds it."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry[1] -= 1
+        if entry[1] > 0:
+            return None
+        del self._entries[key]
+        return entry[0]
 
 
 @dataclass
@@ -15,21 +188,142 @@ class LLMResponse:
     usage: Optional[dict] = None
 
 
+def _cache_for_call(llm: BaseLLM, kwargs: dict) -> Optional[ResponseCache]:
+    """Get the response cache for a call, or None if it must not be cached.
+
+    Pops use_cache from kwargs. Sampling with temperature > 0 and tool
+    calls are never cached.
+    """
+    use_cache = kwargs.pop("use_cache", True)
+    if not use_cache or (kwargs.get("temperature") or 0) > 0 or kwargs.get("tools"):
+        return None
+    return llm.response_cache
+
+
+def _with_response_cache(chat):
+    """Wrap an adapter's chat() with the shared response cache.
+
+    Pass use_cache=False to force a network call.
+    """
+    @wraps(chat)
+    async def wrapper(self: BaseLLM, messages: list[dict], **kwargs) -> LLMResponse:
+        cache = _cache_for_call(self, kwargs)
+        if cache is None:
+            return await chat(self, messages, **kwargs)
+
+        key = cache.make_key(self.provider_name, self.model, messages, kwargs)
+        cached = await cache.get(key)
+        if cached is None and self.semantic_cache is not None and not kwargs:
+            cached = await self.semantic_cache.get(self.provider_name, self.model, messages)
+        if cached is not None:
+            return LLMResponse(**cached)
+
+        response = await chat(self, messages, **kwargs)
+        if response.content:
+            value = asdict(response)
+            await cache.put(key, value)
+            if self.semantic_cache is not None and not kwargs:
+                await self.semantic_cache.put(self.provider_name, self.model, messages, value)
+        return response
+
+    wrapper._response_cached = True
+    return wrapper
+
+
+def _with_stream_response_cache(chat_stream):
+    """Wrap an adapter's chat_stream() with the shared response cache.
+
+    Shares entries with chat(); a hit is yielded as a single chunk. Only
+    streams read to the end are cached, since a consumer that stops early
+    leaves an incomplete reply.
+    """
+    @wraps(chat_stream)
+    async def wrapper(self: BaseLLM, messages: list[dict], **kwargs) -> AsyncIterator[str]:
+        cache = _cache_for_call(self, kwargs)
+        key = None
+        if cache is not None:
+            key = cache.make_key(self.provider_name, self.model, messages, kwargs)
+            cached = await cache.get(key)
+            if cached is not None:
+                yield cached["content"]
+                return
+
+        chunks = []
+        stream = chat_stream(self, messages, **kwargs)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Close the adapter's stream right away when the consumer stops early
+            await stream.aclose()
+
+        content = "".join(chunks)
+        if key is not None and content:
+            await cache.put(key, asdict(LLMResponse(
+                content=content, model=self.model, provider=self.provider_name
+            )))
+
+    wrapper._response_cached = True
+    return wrapper
+
+
 class BaseLLM(ABC):
     """Abstract base class for LLM providers."""
 
     provider_name: str = "base"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Cache every adapter's chat() and chat_stream() without each one opting in
+        chat = cls.__dict__.get("chat")
+        if chat is not None and not getattr(chat, "__isabstractmethod__", False) \
+                and not getattr(chat, "_response_cached", False):
+            cls.chat = _with_response_cache(chat)
+        chat_stream = cls.__dict__.get("chat_stream")
+        if chat_stream is not None and not getattr(chat_stream, "_response_cached", False):
+            cls.chat_stream = _with_stream_response_cache(chat_stream)
+
     def __init__(self, api_key: str, model: str, base_url: Optional[str] = None):
         self.api_key = api_key
         self.model = model
         self.base_url = base_url
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.response_cache: Optional[ResponseCache] = get_response_cache()
+        # Opt-in near-duplicate cache, set up by create_llm from config
+        self.semantic_cache: Optional[SemanticCache] = None
+
+    async def aclose(self) -> None:
+        """Close the adapter's HTTP connection pool."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
+    async def warmup(self) -> None:
+        """Open a pooled connection to the provider without a billed request.
+
+        Adapters override this with a cheap metadata call; the default does
+        nothing.
+        """
 
     @abstractmethod
     async def chat(self, messages: list[dict], **kwargs) -> LLMResponse:
-        """Send a chat completion request."""
+        """Send a chat completion request.
+
+        Pass json_output=True to ask for a JSON object reply through the
+        provider's JSON mode where it has one; the prompt must still
+        describe the expected JSON.
+        """
         pass
 
+    async def chat_stream(self, messages: list[dict], **kwargs) -> AsyncIterator[str]:
+        """Stream a chat completion as text chunks.
+
+        Adapters override this with native streaming; the default yields
+        the full response in one chunk.
+        """
+        response = await self.chat(messages, **kwargs)
+        yield response.content
+
     async def summarize(self, content: str, max_length: int = 200) -> str:
         """Generate a summary of the content (Chinese only, for backward compatibility)."""
         result = await self.summarize_bilingual(content, max_length)
@@ -39,7 +333,8 @@ class BaseLLM(ABC):
         self,
         content: str,
         max_length: int = 200,
-        original_title: str = ""
+        original_title: str = "",
+        on_text: Optional[Callable[[str], None]] = None
     ) -> dict:
         """Generate bilingual summaries and titles.
 
@@ -47,52 +342,27 @@ class BaseLLM(ABC):
             content: The content to summarize
             max_length: Maximum length for summaries
             original_title: Optional original title to translate (instead of generating new one)
+            on_text: Optional callback receiving each new piece of response
+                text as it streams in
 
         Returns:
             dict with keys: title_cn, summary_cn, title_en, summary_en
         """
-        # If we have an original title, ask LLM to translate it
-        if original_title:
-            system_prompt = f"""你是专业翻译。任务：翻译标题+生成摘要。
-
-【必须翻译的原始标题】: {original_title}
-
-【输出格式】:
-标题中文: <在这里写原始标题的完整中文翻译>
-摘要中文: <中文摘要，不超过{max_length}字>
-标题英文: {original_title}
-摘要英文: <English summary, max {max_length} words>
-
-【翻译示例】:
-- "Attention Is All You Need" → "注意力机制是你所需要的一切"
-- "Stabilizing Reinforcement Learning with LLMs: Formulation and Practices" → "稳定大语言模型强化学习：公式化方法与实践"
-- "Chain-of-Thought Prompting Elicits Reasoning" → "思维链提示激发推理能力"
-
-【严格要求】:
-- 中文标题必须翻译原标题的【所有单词】，不能遗漏任何部分
-- 如果原标题是 "A: B" 格式，中文也必须是 "A：B" 格式
-- 英文标题保持原样不变：{original_title}"""
-        else:
-            system_prompt = f"""你是一个双语内容摘要专家。请为内容生成中英双语的标题和摘要。
-
-输出格式（严格遵守）:
-标题中文: [中文标题，简洁有力，不超过30字]
-摘要中文: [中文摘要，不超过{max_length}字]
-标题英文: [English title, concise and informative]
-摘要英文: [English summary, max {max_length} words]
-
-要求:
-1. 标题要简洁有力，能概括内容核心
-2. 摘要要抓住重点，突出价值和亮点
-3. 中英文内容要对应，但不必是直译
-4. 直接按格式输出，不要有其他内容"""
+        system_prompt = _summary_system_prompt(original_title, max_length)
 
         messages = [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"请为以下内容生成双语标题和摘要：\n\n{content[:5000]}"}
+            {"role": "user", "content": f"请为以下内容生成双语标题和摘要：\n\n{content[:SUMMARY_CONTENT_LIMIT]}"}
         ]
-        response = await self.chat(messages)
-        raw = response.content.strip()
+        if on_text:
+            chunks = []
+            async for chunk in self.chat_stream(messages):
+                chunks.append(chunk)
+                on_text(chunk)
+            raw = "".join(chunks).strip()
+        else:
+            response = await self.chat(messages)
+            raw = response.content.strip()
 
         # Parse response
         result = {
@@ -102,30 +372,17 @@ class BaseLLM(ABC):
             "summary_en": ""
         }
 
-        for line in raw.split("\n"):
-            line = line.strip()
-            if line.startswith("标题中文:") or line.startswith("标题中文："):
-                result["title_cn"] = line.split(":", 1)[-1].split("：", 1)[-1].strip()
-            elif line.startswith("摘要中文:") or line.startswith("摘要中文："):
-                result["summary_cn"] = line.split(":", 1)[-1].split("：", 1)[-1].strip()
-            elif line.startswith("标题英文:") or line.startswith("标题英文："):
-                result["title_en"] = line.split(":", 1)[-1].split("：", 1)[-1].strip()
-            elif line.startswith("摘要英文:") or line.startswith("摘要英文："):
-                result["summary_en"] = line.split(":", 1)[-1].split("：", 1)[-1].strip()
+        for match in BILINGUAL_FIELD_PATTERN.finditer(raw):
+            result[BILINGUAL_FIELD_KEYS[match.group(1)]] = match.group(2)
 
         # Ensure English title falls back to original if not parsed
         if not result["title_en"] and original_title:
             result["title_en"] = original_title
 
-        # Validate Chinese title - if too short, it's probably incomplete
-        if original_title and result["title_cn"]:
-            en_word_count = len(original_title.split())
-            cn_char_count = len(result["title_cn"])
-            # If Chinese title has fewer chars than English words, it's likely incomplete
-            # A proper translation should have at least 1.5x chars as English words
-            if cn_char_count < en_word_count * 1.2:
-                # Try to generate a better translation
-                result["title_cn"] = await self._translate_title(original_title)
+        # Only fall back to a separate translation call if the title is missing;
+        # completeness is enforced by the self-check in the prompt instead
+        if original_title and not result["title_cn"]:
+            result["title_cn"] = await self._translate_title(original_title)
 
         return result
 
@@ -134,7 +391,7 @@ class BaseLLM(ABC):
         messages = [
             {
                 "role": "system",
-                "content": "你是翻译专家。将英文标题翻译为中文，要求完整准确，不遗漏任何单词。只输出翻译结果，不要其他内容。"
+                "content": TRANSLATE_TITLE_PROMPT
             },
             {
                 "role": "user",
@@ -144,60 +401,38 @@ class BaseLLM(ABC):
         response = await self.chat(messages)
         return response.content.strip()
 
-    async def suggest_tags(self, content: str, preset_tags: list[str]) -> list[str]:
+    async def suggest_tags(
+        self,
+        content: str,
+        preset_tags: list[str],
+        preset_lower: Optional[dict[str, str]] = None,
+        max_chars: Optional[int] = TAG_CONTENT_LIMIT
+    ) -> list[str]:
         """Suggest tags for the content based on preset tags.
 
         Returns ALL matching preset tags, no limit on number.
+
+        Args:
+            preset_lower: Optional precomputed {tag.lower(): tag} map of preset_tags
+            max_chars: Content character limit; None if the caller already cut it
         """
-        tags_str = ", ".join(preset_tags)
         messages = [
             {
                 "role": "system",
-                "content": f"""你是一个内容分类专家。你的任务是分析内容并从预设标签中选择所有相关的标签。
-
-预设标签列表: [{tags_str}]
-
-分析步骤:
-1. 仔细阅读内容，理解其主题、领域和关键概念
-2. 对照每个预设标签，判断内容是否与该标签相关
-3. 选择所有相关的标签（不限数量，只要相关就选）
-
-标签含义参考:
-- AI: 人工智能相关
-- LLM: 大语言模型相关
-- VLM: 视觉语言模型相关
-- Agent: AI Agent、智能体相关
-- Paper: 学术论文
-- 预训练/后训练: 模型训练相关
-- 强化学习/RL: 强化学习相关
-- 多模态/Multi-modal: 多模态相关
-- Research: 研究相关
-- Tutorial: 教程相关
-- Programming: 编程相关
-- Model: 模型相关
-- Dataset: 数据集相关
-
-输出要求:
-- 只输出标签名，用英文逗号分隔
-- 必须从预设标签中选择，完全匹配（包括大小写）
-- 选择所有相关的标签，不要遗漏
-- 不要输出任何解释"""
+                "content": _suggest_tags_system_prompt(tuple(preset_tags))
             },
             {
                 "role": "user",
-                "content": f"分析以下内容并选择所有相关的预设标签：\n\n{content[:3000]}"
+                "content": f"分析以下内容并选择所有相关的预设标签：\n\n{content[:max_chars]}"
             }
         ]
         response = await self.chat(messages)
-        # Parse tags from response
-        raw_tags = response.content.strip()
-        tags = [t.strip() for t in raw_tags.replace("，", ",").split(",")]
-        # Filter to only include valid preset tags (case-insensitive matching)
-        preset_lower = {t.lower(): t for t in preset_tags}
-        valid_tags = []
-        for t in tags:
-            if t in preset_tags:
-                valid_tags.append(t)
-            elif t.lower() in preset_lower:
-                valid_tags.append(preset_lower[t.lower()])
-        return valid_tags if valid_tags else []
+        # Parse tags from response, keeping only preset tags (case-insensitive)
+        if preset_lower is None:
+            preset_lower = {t.lower(): t for t in preset_tags}
+        raw_tags = response.content.translate(_FULLWIDTH_COMMA)
+        return [
+            preset_lower[key]
+            for t in raw_tags.split(",")
+            if (key := t.strip().lower()) in preset_lower
+        ]
@@ -0,0 +1,193 @@
+"""Response cache for LLM chat calls."""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional
+
+from ..config import get_config_dir
+from ..llm_cache import LLMCache
+from ..util import json_dumps, json_loads, to_thread_fast
+
+# Request kwargs that change the response and therefore belong in the key
+CACHE_KEY_KWARGS = frozenset({"temperature", "top_p", "max_tokens", "tools", "json_output"})
+
+
+class ResponseCache:
+    """Two-level chat response cache: in-memory LRU in front of the disk LLMCache."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, disk: Optional[LLMCache] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk = disk
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: list[dict], kwargs: dict) -> str:
+        """Build a cache key from the provider, model, messages and relevant kwargs."""
+        payload = json_dumps(
+            {
+                "messages": messages,
+                "kwargs": {k: v for k, v in kwargs.items() if k in CACHE_KEY_KWARGS},
+            },
+            sort_keys=True,
+        )
+        return LLMCache.make_key(provider, model, "chat", payload.decode("utf-8"))
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Get a cached response dict, or None on a miss."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.monotonic() < expires_at:
+                self._memory.move_to_end(key)
+                return value
+            del self._memory[key]
+
+        if self.disk is not None:
+            value = await self.disk.get(key)
+            if value is not None:
+                self._remember(key, value)
+                return value
+
+        return None
+
+    async def put(self, key: str, value: dict) -> None:
+        """Store a response dict in memory and on disk."""
+        self._remember(key, value)
+        if self.disk is not None:
+            await self.disk.put(key, value)
+
+    def _remember(self, key: str, value: dict) -> None:
+        self._memory[key] = (time.monotonic() + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache, shared by all adapters."""
+    global _response_cache
+    if _response_cache is None:
+        ttl = 3600
+        disk = LLMCache(cache_dir=get_config_dir() / "cache" / "chat", ttl=ttl)
+        _response_cache = ResponseCache(ttl=ttl, disk=disk)
+    return _response_cache
+
+
+class SemanticCache:
+    """Near-duplicate prompt cache using sentence embeddings.
+
+    Only user/assistant turns are embedded; the system prompt must match
+    exactly, since a long shared system prompt would otherwise dominate the
+    embedding. Needs the optional sentence-transformers package.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        model_name: str = "all-MiniLM-L6-v2",
+        db_path: Optional[Path] = None,
+    ):
+        # Import eagerly so a missing optional dependency fails at setup time
+        import numpy
+        from sentence_transformers import SentenceTransformer
+
+        self._np = numpy
+        self._model_cls = SentenceTransformer
+        self._model = None
+        self.threshold = threshold
+        self.model_name = model_name
+        self.db_path = db_path or get_config_dir() / "semantic_cache.sqlite"
+        # (provider, model, system hash) -> (embedding matrix, responses)
+        self._index: Optional[dict[tuple[str, str, str], tuple[Any, list[dict]]]] = None
+        self._lock = threading.Lock()
+
+    async def get(self, provider: str, model: str, messages: list[dict]) -> Optional[dict]:
+        """Get the response of the most similar cached prompt above the threshold."""
+        return await to_thread_fast(self._lookup, provider, model, messages)
+
+    async def put(self, provider: str, model: str, messages: list[dict], value: dict) -> None:
+        """Store a response under the prompt's embedding."""
+        await to_thread_fast(self._add, provider, model, messages, value)
+
+    @staticmethod
+    def _split(messages: list[dict]) -> tuple[str, str]:
+        system_hash = hashlib.sha256("\n".join(
+            m["content"] for m in messages if m["role"] == "system"
+        ).encode("utf-8")).hexdigest()
+        text = "\n".join(m["content"] for m in messages if m["role"] != "system")
+        return system_hash, text
+
+    def _embed(self, text: str):
+        if self._model is None:
+            self._model = self._model_cls(self.model_name, device="cpu")
+        return self._model.encode(text, normalize_embeddings=True).astype("float32")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "provider TEXT, model TEXT, system_hash TEXT, embedding BLOB, response TEXT)"
+        )
+        return conn
+
+    def _load(self) -> dict:
+        """Build the in-memory index from the database on first use."""
+        if self._index is not None:
+            return self._index
+
+        rows: dict[tuple[str, str, str], tuple[list, list[dict]]] = {}
+        with closing(self._connect()) as conn:
+            for provider, model, system_hash, blob, response in conn.execute(
+                "SELECT provider, model, system_hash, embedding, response FROM entries"
+            ):
+                vectors, responses = rows.setdefault((provider, model, system_hash), ([], []))
+                vectors.append(self._np.frombuffer(blob, dtype="float32"))
+                responses.append(json_loads(response))
+
+        self._index = {
+            key: (self._np.vstack(vectors), responses)
+            for key, (vectors, responses) in rows.items()
+        }
+        return self._index
+
+    def _lookup(self, provider: str, model: str, messages: list[dict]) -> Optional[dict]:
+        system_hash, text = self._split(messages)
+        with self._lock:
+            entry = self._load().get((provider, model, system_hash))
+            if entry is None:
+                return None
+            matrix, responses = entry
+            # Embeddings are L2-normalized, so the dot product is cosine similarity
+            scores = matrix @ self._embed(text)
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                return responses[best]
+        return None
+
+    def _add(self, provider: str, model: str, messages: list[dict], value: dict) -> None:
+        system_hash, text = self._split(messages)
+        with self._lock:
+            index = self._load()
+            vector = self._embed(text)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (provider, model, system_hash, vector.tobytes(),
+                     json_dumps(value).decode("utf-8")),
+                )
+            key = (provider, model, system_hash)
+            if key in index:
+                matrix, responses = index[key]
+                index[key] = (self._np.vstack([matrix, vector]), responses + [value])
+            else:
+                index[key] = (vector[None, :], [value])
@@ -1,19 +1,28 @@
 """Factory for creating LLM instances."""
 from __future__ import annotations
 
+import importlib
+import logging
 from typing import Optional
 
 from ..config import Config, LLMProviderConfig, get_provider_config
 from .base import BaseLLM
-from .openai_compat import (
-    OpenAICompatibleLLM,
-    DeepSeekLLM,
-    KimiLLM,
-    MiniMaxLLM,
-    GLMLLM,
-)
-from .anthropic_llm import AnthropicLLM
-from .gemini_llm import GeminiLLM
+from .cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+
+# Provider name -> (adapter module, class name). Adapters are imported on
+# demand so only the selected provider's SDK is loaded at startup.
+PROVIDER_CLASSES = {
+    "openai": (".openai_compat", "OpenAICompatibleLLM"),
+    "anthropic": (".anthropic_llm", "AnthropicLLM"),
+    "gemini": (".gemini_llm", "GeminiLLM"),
+    "deepseek": (".openai_compat", "DeepSeekLLM"),
+    "kimi": (".openai_compat", "KimiLLM"),
+    "minimax": (".openai_compat", "MiniMaxLLM"),
+    "glm": (".openai_compat", "GLMLLM"),
+}
 
 
 def create_llm(config: Config, provider: Optional[str] = None) -> BaseLLM:
@@ -38,56 +47,37 @@ def create_llm(config: Config, provider: Optional[str] = None) -> BaseLLM:
             f"Set it in ~/.kb/config.yaml or via environment variable."
         )
 
-    return _create_provider_llm(provider_name, provider_config)
+    llm = _create_provider_llm(provider_name, provider_config)
+
+    semantic_config = config.llm.semantic_cache
+    if semantic_config.enabled:
+        try:
+            llm.semantic_cache = SemanticCache(threshold=semantic_config.threshold)
+        except ImportError:
+            # Logged rather than warned: the CLI filters all warnings at startup
+            logger.warning(
+                "llm.semantic_cache is enabled but sentence-transformers is not installed"
+            )
+
+    return llm
 
 
 def _create_provider_llm(provider_name: str, config: LLMProviderConfig) -> BaseLLM:
     """Create LLM instance for a specific provider."""
-    factories = {
-        "openai": lambda c: OpenAICompatibleLLM(
-            api_key=c.api_key,
-            model=c.model,
-            base_url=c.base_url,
-            provider_name="openai"
-        ),
-        "anthropic": lambda c: AnthropicLLM(
-            api_key=c.api_key,
-            model=c.model,
-            base_url=c.base_url
-        ),
-        "gemini": lambda c: GeminiLLM(
-            api_key=c.api_key,
-            model=c.model
-        ),
-        "deepseek": lambda c: DeepSeekLLM(
-            api_key=c.api_key,
-            model=c.model,
-            base_url=c.base_url
-        ),
-        "kimi": lambda c: KimiLLM(
-            api_key=c.api_key,
-            model=c.model,
-            base_url=c.base_url
-        ),
-        "minimax": lambda c: MiniMaxLLM(
-            api_key=c.api_key,
-            model=c.model,
-            base_url=c.base_url
-        ),
-        "glm": lambda c: GLMLLM(
-            api_key=c.api_key,
-            model=c.model,
-            base_url=c.base_url
-        ),
-    }
-
-    factory = factories.get(provider_name)
-    if factory is None:
+    entry = PROVIDER_CLASSES.get(provider_name)
+    if entry is None:
         raise ValueError(f"Unknown LLM provider: {provider_name}")
 
-    return factory(config)
+    module_name, class_name = entry
+    llm_class = getattr(importlib.import_module(module_name, __package__), class_name)
+
+    return llm_class(
+        api_key=config.api_key,
+        model=config.model,
+        base_url=config.base_url
+    )
 
 
 def list_providers() -> list[str]:
     """List all available LLM providers."""
-    return ["openai", "anthropic", "gemini", "deepseek", "kimi", "minimax", "glm"]
+    return list(PROVIDER_CLASSES)
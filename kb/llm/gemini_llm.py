@@ -3,12 +3,20 @@ from __future__ import annotations
 
 import asyncio
 import re
-from typing import Optional
+import time
+from typing import AsyncIterator, Optional
 
 from google import genai
 from google.genai import types
 
-from .base import BaseLLM, LLMResponse
+from .base import BaseLLM, LLMResponse, backoff_delay, is_rate_limited
+
+
+# Matches the "retry in 12.3s" hint in rate-limit errors
+_RETRY_DELAY_PATTERN = re.compile(r'retry.*?(\d+\.?\d*)s', re.IGNORECASE)
+
+# API key -> client shared by all adapter instances
+_CLIENT_CACHE: dict[str, genai.Client] = {}
 
 
 class GeminiLLM(BaseLLM):
@@ -30,22 +38,56 @@ class GeminiLLM(BaseLLM):
         base_url: Optional[str] = None
     ):
         super().__init__(api_key, model, base_url)
-        self.client = genai.Client(api_key=api_key)
+        # Reuse one client (and its connection pool) per API key
+        client = _CLIENT_CACHE.get(api_key)
+        if client is None:
+            client = _CLIENT_CACHE[api_key] = genai.Client(api_key=api_key)
+        self.client = client
+        # Bound once instead of walking client.aio.models on every attempt
+        self._generate = client.aio.models.generate_content
+        # Model -> monotonic time until which it is skipped after a 429
+        self._model_cooldown: dict[str, float] = {}
+
+    async def warmup(self) -> None:
+        """Open the connection with a models-list request (not billed)."""
+        await self.client.aio.models.list(config={"page_size": 1})
+
+    def _models_to_try(self) -> list[str]:
+        """Current model first, then fallbacks, skipping models in a 429 cooldown."""
+        candidates = list(dict.fromkeys([self.model, *self.FALLBACK_MODELS]))
+        now = time.monotonic()
+        models = [m for m in candidates if self._model_cooldown.get(m, 0.0) <= now]
+        if not models:
+            # Everything is cooling down; try the one that recovers first
+            models = [min(candidates, key=lambda m: self._model_cooldown[m])]
+        return models
+
+    def _cool_down(self, model: str, error_str: str) -> None:
+        """Skip a rate-limited model until its retry hint (or 5s) has passed."""
+        cooldown = self._extract_retry_delay(error_str) or 5.0
+        self._model_cooldown[model] = time.monotonic() + cooldown
 
     async def chat(self, messages: list[dict], **kwargs) -> LLMResponse:
         """Send a chat completion request with retry and fallback."""
-        # Try current model first, then fallbacks
-        models_to_try = [self.model] + [m for m in self.FALLBACK_MODELS if m != self.model]
+        # Models rate limited recently are skipped so we don't spend a
+        # round-trip on them
+        models_to_try = self._models_to_try()
+
+        # Convert messages once; every model and retry reuses the same objects
+        contents, config = self._build_request(
+            messages, json_output=kwargs.pop("json_output", False)
+        )
 
         last_error = None
         for model in models_to_try:
             try:
-                return await self._chat_with_retry(messages, model, **kwargs)
+                return await self._chat_with_retry(contents, config, model, **kwargs)
             except Exception as e:
                 last_error = e
                 error_str = str(e)
-                # If rate limited, try next model
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+                # If rate limited, cool the model down and try the next one
+                if is_rate_limited(error_str):
+                    self._cool_down(model, error_str)
                     continue
                 # Other errors, raise immediately
                 raise
@@ -55,34 +97,13 @@ class GeminiLLM(BaseLLM):
 
     async def _chat_with_retry(
         self,
-        messages: list[dict],
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
         model: str,
         max_retries: int = 3,
         **kwargs
     ) -> LLMResponse:
-        """Send chat with retry logic for rate limits."""
-        # Extract system instruction and convert messages
-        system_instruction = None
-        contents = []
-
-        for msg in messages:
-            if msg["role"] == "system":
-                system_instruction = msg["content"]
-            elif msg["role"] == "user":
-                contents.append(types.Content(
-                    role="user",
-                    parts=[types.Part(text=msg["content"])]
-                ))
-            elif msg["role"] == "assistant":
-                contents.append(types.Content(
-                    role="model",
-                    parts=[types.Part(text=msg["content"])]
-                ))
-
-        # Build config
-        config = types.GenerateContentConfig(
-            system_instruction=system_instruction,
-        )
+        """Send prebuilt contents with retry logic for rate limits."""
 
         # Generate response - use full model path
         model_name = model
@@ -91,7 +112,7 @@ class GeminiLLM(BaseLLM):
 
         for attempt in range(max_retries):
             try:
-                response = await self.client.aio.models.generate_content(
+                response = await self._generate(
                     model=model_name,
                     contents=contents,
                     config=config,
@@ -114,9 +135,11 @@ class GeminiLLM(BaseLLM):
                 )
             except Exception as e:
                 error_str = str(e)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                    # Extract retry delay if available
-                    delay = self._extract_retry_delay(error_str)
+                if is_rate_limited(error_str):
+                    # Jittered backoff, honoring the server's retry hint as a minimum
+                    delay = backoff_delay(
+                        attempt, minimum=self._extract_retry_delay(error_str) or 0.0, base=2.0
+                    )
                     if attempt < max_retries - 1:
                         await asyncio.sleep(delay)
                         continue
@@ -124,10 +147,74 @@ class GeminiLLM(BaseLLM):
 
         raise Exception(f"Max retries exceeded for model {model}")
 
-    def _extract_retry_delay(self, error_str: str) -> float:
-        """Extract retry delay from error message, default to exponential backoff."""
+    def _build_request(
+        self, messages: list[dict], json_output: bool = False
+    ) -> tuple[list[types.Content], types.GenerateContentConfig]:
+        """Convert chat messages to Gemini contents and config."""
+        # Extract system instruction and convert messages
+        system_instruction = None
+        contents = []
+
+        for msg in messages:
+            if msg["role"] == "system":
+                system_instruction = msg["content"]
+            elif msg["role"] == "user":
+                contents.append(types.Content(
+                    role="user",
+                    parts=[types.Part(text=msg["content"])]
+                ))
+            elif msg["role"] == "assistant":
+                contents.append(types.Content(
+                    role="model",
+                    parts=[types.Part(text=msg["content"])]
+                ))
+
+        # Build config
+        config = types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            response_mime_type="application/json" if json_output else None,
+        )
+        return contents, config
+
+    async def chat_stream(self, messages: list[dict], **kwargs) -> AsyncIterator[str]:
+        """Stream a chat completion as text chunks.
+
+        Falls back to chat() (with retry and model fallback) if the stream
+        fails before producing any text.
+        """
+        contents, config = self._build_request(
+            messages, json_output=kwargs.pop("json_output", False)
+        )
+        # Start from the same model chat() would use, so a model in a 429
+        # cooldown isn't hit again
+        model = self._models_to_try()[0]
+        model_name = model
+        if not model_name.startswith("models/"):
+            model_name = f"models/{model_name}"
+
+        started = False
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=model_name,
+                contents=contents,
+                config=config,
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    started = True
+                    yield chunk.text
+        except Exception as e:
+            if started:
+                raise
+            if is_rate_limited(str(e)):
+                self._cool_down(model, str(e))
+            response = await self.chat(messages, **kwargs)
+            yield response.content
+
+    def _extract_retry_delay(self, error_str: str) -> Optional[float]:
+        """Extract the server's retry delay from an error message, if present."""
         # Try to find "retry in Xs" pattern
-        match = re.search(r'retry.*?(\d+\.?\d*)s', error_str.lower())
+        match = _RETRY_DELAY_PATTERN.search(error_str)
         if match:
             return min(float(match.group(1)) + 1, 60)  # Add 1s buffer, max 60s
-        return 5.0  # Default 5 seconds
+        return None
@@ -10,16 +10,24 @@ Works with:
 """
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+from typing import AsyncIterator, Optional
 
 from openai import AsyncOpenAI
 
-from .base import BaseLLM, LLMResponse
+from .base import BaseLLM, LLMResponse, SharedClients, create_http_client
+
+
+# (base_url, api_key) -> client shared by all adapter instances
+_CLIENTS = SharedClients()
 
 
 class OpenAICompatibleLLM(BaseLLM):
     """LLM adapter for OpenAI-compatible APIs."""
 
+    # Whether the endpoint accepts response_format={"type": "json_object"}
+    supports_json_mode: bool = True
+
     def __init__(
         self,
         api_key: str,
@@ -29,16 +37,48 @@ class OpenAICompatibleLLM(BaseLLM):
     ):
         super().__init__(api_key, model, base_url)
         self.provider_name = provider_name
-        self.client = AsyncOpenAI(
+        # Reuse one client (and its connection pool) per endpoint and key
+        self._client_key = (base_url or "", api_key)
+        self._released = False
+        self.client = _CLIENTS.acquire(self._client_key, lambda: AsyncOpenAI(
             api_key=api_key,
-            base_url=base_url
-        )
+            base_url=base_url,
+            http_client=create_http_client()
+        ))
+
+    async def aclose(self) -> None:
+        """Release the shared client, closing it once no adapter uses it."""
+        if self._released:
+            return
+        self._released = True
+        client = _CLIENTS.release(self._client_key)
+        if client is not None:
+            await client.close()
+
+    async def warmup(self) -> None:
+        """Open the connection with a models-list request (not billed)."""
+        await self.client.models.list()
+
+    def _prompt_cache_kwargs(self, messages: list[dict]) -> dict:
+        """Route requests sharing a system prompt to the same OpenAI prompt cache.
+
+        OpenAI caches long prompt prefixes automatically; the cache key only
+        improves hit rates, so it is sent to OpenAI itself and not to
+        compatible providers that may reject unknown fields.
+        """
+        if self.provider_name != "openai" or not messages or messages[0]["role"] != "system":
+            return {}
+        key = hashlib.sha1(messages[0]["content"].encode("utf-8")).hexdigest()
+        return {"extra_body": {"prompt_cache_key": key}}
 
     async def chat(self, messages: list[dict], **kwargs) -> LLMResponse:
         """Send a chat completion request."""
+        if kwargs.pop("json_output", False) and self.supports_json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=messages,
+            **self._prompt_cache_kwargs(messages),
             **kwargs
         )
 
@@ -49,6 +89,10 @@ class OpenAICompatibleLLM(BaseLLM):
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens,
             }
+            # Automatic prompt caching: prompt tokens served from the cache
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            if details is not None:
+                usage["cache_read_tokens"] = getattr(details, "cached_tokens", None) or 0
 
         return LLMResponse(
             content=response.choices[0].message.content or "",
@@ -57,6 +101,22 @@ class OpenAICompatibleLLM(BaseLLM):
             usage=usage
         )
 
+    async def chat_stream(self, messages: list[dict], **kwargs) -> AsyncIterator[str]:
+        """Stream a chat completion as text chunks."""
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            **self._prompt_cache_kwargs(messages),
+            **kwargs
+        )
+        # Close the response when the consumer stops early, so the server
+        # stops generating and the connection returns to the pool
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
 
 class DeepSeekLLM(OpenAICompatibleLLM):
     """DeepSeek LLM adapter."""
@@ -85,6 +145,9 @@ class KimiLLM(OpenAICompatibleLLM):
 class MiniMaxLLM(OpenAICompatibleLLM):
     """MiniMax LLM adapter."""
 
+    # JSON mode is not supported on all MiniMax chat models
+    supports_json_mode = False
+
     def __init__(self, api_key: str, model: str = "abab6.5s-chat", base_url: Optional[str] = None):
         super().__init__(
             api_key=api_key,
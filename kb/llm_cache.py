@@ -0,0 +1,100 @@
+"""Persistent content-addressable cache for LLM results."""
+from __future__ import annotations
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from .config import get_config_dir
+from .util import json_dumps, json_loads, to_thread_fast
+
+
+class LLMCache:
+    """Disk cache for LLM results, stored as JSON under cache_dir/<sha256>.json."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 1000,
+    ):
+        self.cache_dir = cache_dir or get_config_dir() / "cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Eviction scans the whole directory, so it runs once per this many
+        # writes; the cache may briefly hold up to this many extra entries
+        self.evict_interval = max(1, max_entries // 10)
+        self._writes_since_evict = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt_version: str, *parts: str) -> str:
+        """Build a cache key from the provider, model, prompt version and content.
+
+        Each part is length-prefixed so different splits of the same bytes
+        never hash to the same key.
+        """
+        digest = hashlib.sha256()
+        for part in (provider, model, prompt_version, *parts):
+            data = part.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+        return await to_thread_fast(self._read, key)
+
+    async def put(self, key: str, value: Any) -> None:
+        """Store a value in the cache."""
+        await to_thread_fast(self._write, key, value)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return None
+
+        # Revalidate: drop entries older than the TTL
+        if self.ttl and time.time() - mtime > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            return json_loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(json_dumps(value))
+            tmp_path.replace(path)
+        except (OSError, TypeError):
+            return
+        self._writes_since_evict += 1
+        if self._writes_since_evict >= self.evict_interval:
+            self._writes_since_evict = 0
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove the oldest entries once the cache exceeds max_entries."""
+        entries = list(self.cache_dir.glob("*.json"))
+        if len(entries) <= self.max_entries:
+            return
+
+        def _mtime(p: Path) -> float:
+            try:
+                return p.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        entries.sort(key=_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            path.unlink(missing_ok=True)
@@ -1,10 +1,10 @@
 """Content processors for different input types."""
 
 from .base import BaseProcessor, ProcessedContent, ContentType
-from .link import LinkProcessor, extract_urls
+from .link import LinkProcessor, close_http_client, extract_urls
 from .file import FileProcessor
 from .text import TextProcessor
-from .factory import detect_and_process, detect_input_type, UnsupportedFileError
+from .factory import detect_and_process, detect_and_process_many, detect_input_type, UnsupportedFileError
 
 __all__ = [
     "BaseProcessor",
@@ -14,7 +14,9 @@ __all__ = [
     "FileProcessor",
     "TextProcessor",
     "detect_and_process",
+    "detect_and_process_many",
     "detect_input_type",
     "extract_urls",
+    "close_http_client",
     "UnsupportedFileError",
 ]
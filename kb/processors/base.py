@@ -1,9 +1,11 @@
 """Base class for content processors."""
 from __future__ import annotations
 
+import io
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -78,17 +80,42 @@ TAG_TRANSLATIONS = {
 }
 
 
+# Lowercased keys for case-insensitive lookup; the first spelling wins, as
+# in the original scan over TAG_TRANSLATIONS
+_TAG_TRANSLATIONS_CI: dict[str, str] = {}
+for _key, _value in TAG_TRANSLATIONS.items():
+    _TAG_TRANSLATIONS_CI.setdefault(_key.lower(), _value)
+del _key, _value
+
+
+# Deletes hyphens in one C-level pass (Telegram hashtags can't contain them)
+_STRIP_HYPHENS = str.maketrans("", "", "-")
+
+
+@lru_cache(maxsize=512)
 def get_tag_translation(tag: str) -> Optional[str]:
     """Get translation for a tag if available."""
-    # Try exact match first
-    if tag in TAG_TRANSLATIONS:
-        return TAG_TRANSLATIONS[tag]
-    # Try case-insensitive match
-    tag_lower = tag.lower()
-    for k, v in TAG_TRANSLATIONS.items():
-        if k.lower() == tag_lower:
-            return v
-    return None
+    # Try exact match first, then case-insensitive
+    return TAG_TRANSLATIONS.get(tag) or _TAG_TRANSLATIONS_CI.get(tag.lower())
+
+
+def clean_path(input_str: str) -> str:
+    """Clean file path from drag-drop artifacts."""
+    input_str = input_str.strip()
+
+    # Remove quotes
+    if (input_str.startswith("'") and input_str.endswith("'")) or \
+       (input_str.startswith('"') and input_str.endswith('"')):
+        input_str = input_str[1:-1]
+
+    # Handle escaped spaces
+    return input_str.replace("\\ ", " ")
+
+
+@lru_cache(maxsize=256)
+def expand_path(input_str: str) -> Path:
+    """Clean a drag-dropped file path and expand ~."""
+    return Path(clean_path(input_str)).expanduser()
 
 
 class ContentType(Enum):
@@ -125,147 +152,126 @@ class ProcessedContent:
     # For images
     image_description: Optional[str] = None
 
-    # Original raw data
+    # Original raw data (file content is not kept in memory; see load_raw_data)
     raw_data: Optional[bytes] = None
 
-    def _get_chinese_tags(self) -> list[str]:
-        """Get Chinese tags with translations."""
+    # Memoized (tags, (cn_tags, en_tags)) for repeated preview/publish formatting
+    _bilingual_tags: Optional[tuple[tuple[str, ...], tuple[list[str], list[str]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def load_raw_data(self) -> Optional[bytes]:
+        """Get the original bytes, reading them from file_path on demand."""
+        if self.raw_data is not None:
+            return self.raw_data
+        if self.file_path is not None:
+            return self.file_path.read_bytes()
+        return None
+
+    def _compute_bilingual_tags(self) -> tuple[list[str], list[str]]:
+        """Get (Chinese tags, English tags) with translations in one pass."""
+        key = tuple(self.tags)
+        if self._bilingual_tags is not None and self._bilingual_tags[0] == key:
+            return self._bilingual_tags[1]
+
         chinese_tags = []
-        seen = set()
+        english_tags = []
+        cn_seen = set()
+        en_seen = set()
+
+        def add_english(clean: str) -> None:
+            if clean not in en_seen:
+                english_tags.append(f"#{clean}")
+                en_seen.add(clean)
+            # Add lowercase (or capitalized) variant
+            variant = clean.lower() if clean[0].isupper() else clean.capitalize()
+            if variant != clean and variant not in en_seen:
+                english_tags.append(f"#{variant}")
+                en_seen.add(variant)
+
         for tag in self.tags:
             # Remove hyphens for Telegram compatibility
-            clean_tag = tag.replace("-", "")
+            clean_tag = tag.translate(_STRIP_HYPHENS)
             if not clean_tag:
                 continue
 
-            # If tag is Chinese, use directly
+            translation = get_tag_translation(tag)
             if not clean_tag.isascii():
-                if clean_tag not in seen:
+                # Chinese tag - use directly, translate to English
+                if clean_tag not in cn_seen:
                     chinese_tags.append(f"#{clean_tag}")
-                    seen.add(clean_tag)
+                    cn_seen.add(clean_tag)
+                if translation and translation.isascii():
+                    clean_trans = translation.translate(_STRIP_HYPHENS)
+                    if clean_trans:
+                        add_english(clean_trans)
             else:
-                # English tag - try to translate to Chinese
-                translation = get_tag_translation(tag)
+                # English tag - translate to Chinese, also keep the English tag
                 if translation and not translation.isascii():
-                    if translation not in seen:
+                    if translation not in cn_seen:
                         chinese_tags.append(f"#{translation}")
-                        seen.add(translation)
-                # Also keep the English tag (without hyphen)
-                if clean_tag not in seen:
+                        cn_seen.add(translation)
+                if clean_tag not in cn_seen:
                     chinese_tags.append(f"#{clean_tag}")
-                    seen.add(clean_tag)
-        return chinese_tags
+                    cn_seen.add(clean_tag)
+                add_english(clean_tag)
+
+        result = (chinese_tags, english_tags)
+        self._bilingual_tags = (key, result)
+        return result
+
+    def _get_chinese_tags(self) -> list[str]:
+        """Get Chinese tags with translations."""
+        return self._compute_bilingual_tags()[0]
 
     def _get_english_tags(self) -> list[str]:
         """Get English tags with translations."""
-        english_tags = []
-        seen = set()
-        for tag in self.tags:
-            # If tag is English/ASCII, use directly
-            if tag.isascii():
-                # Remove hyphens for Telegram compatibility
-                clean_tag = tag.replace("-", "")
-                if clean_tag and clean_tag not in seen:
-                    english_tags.append(f"#{clean_tag}")
-                    seen.add(clean_tag)
-                # Add lowercase variant
-                if clean_tag:
-                    variant = clean_tag.lower() if clean_tag[0].isupper() else clean_tag.capitalize()
-                    if variant != clean_tag and variant not in seen:
-                        english_tags.append(f"#{variant}")
-                        seen.add(variant)
-            else:
-                # Chinese tag - try to translate to English
-                translation = get_tag_translation(tag)
-                if translation and translation.isascii():
-                    # Remove hyphens for Telegram compatibility
-                    clean_trans = translation.replace("-", "")
-                    if clean_trans and clean_trans not in seen:
-                        english_tags.append(f"#{clean_trans}")
-                        seen.add(clean_trans)
-                    # Add lowercase variant
-                    if clean_trans:
-                        variant = clean_trans.lower() if clean_trans[0].isupper() else clean_trans.capitalize()
-                        if variant != clean_trans and variant not in seen:
-                            english_tags.append(f"#{variant}")
-                            seen.add(variant)
-        return english_tags
+        return self._compute_bilingual_tags()[1]
 
     def format_for_telegram(self) -> str:
         """Format the content for Telegram message in bilingual format."""
-        lines = []
-
-        # === Chinese Section ===
-        # Chinese title
-        cn_title = self.title
-        lines.append(f"📌 {cn_title}")
-        lines.append("")
-
-        # Publish date
-        if self.publish_date:
-            lines.append(f"📅 {self.publish_date}")
-            lines.append("")
+        # Every line is written with a trailing newline; the last one is
+        # dropped at the end, matching "\n".join over the lines
+        buf = io.StringIO()
+        w = buf.write
 
-        # Chinese summary
-        if self.summary:
-            lines.append(f"📝 {self.summary}")
-            lines.append("")
-
-        # Source link (Chinese section)
+        # Source line, shared by both sections
+        source_line = ""
         if self.source:
-            if self.content_type == ContentType.LINK:
-                lines.append(f"🔗 {self.source}")
-            elif self.file_path:
-                lines.append(f"📎 {self.file_path.name}")
+            if self.content_type != ContentType.LINK and self.file_path:
+                source_line = f"📎 {self.file_path.name}\n\n"
             else:
-                lines.append(f"🔗 {self.source}")
-            lines.append("")
+                source_line = f"🔗 {self.source}\n\n"
+        date_line = f"📅 {self.publish_date}\n\n" if self.publish_date else ""
+
+        # === Chinese Section ===
+        w(f"📌 {self.title}\n\n")
+        w(date_line)
+        if self.summary:
+            w(f"📝 {self.summary}\n\n")
+        w(source_line)
 
         # Chinese tags
-        cn_tags = self._get_chinese_tags()
+        cn_tags, en_tags = self._compute_bilingual_tags()
         if cn_tags:
-            lines.append(f"🏷️ {' '.join(cn_tags)}")
+            w(f"🏷️ {' '.join(cn_tags)}\n")
 
         # Separator
-        lines.append("")
-        lines.append("─" * 20)
-        lines.append("")
+        w("\n" + "─" * 20 + "\n\n")
 
         # === English Section ===
-        # English title
-        en_title = self.title_en or self.title
-        lines.append(f"📌 {en_title}")
-        lines.append("")
-
-        # Publish date (same for both sections)
-        if self.publish_date:
-            lines.append(f"📅 {self.publish_date}")
-            lines.append("")
-
-        # English summary
-        if self.summary_en:
-            lines.append(f"📝 {self.summary_en}")
-            lines.append("")
-        elif self.summary:
-            lines.append(f"📝 {self.summary}")
-            lines.append("")
-
-        # Source link (English section)
-        if self.source:
-            if self.content_type == ContentType.LINK:
-                lines.append(f"🔗 {self.source}")
-            elif self.file_path:
-                lines.append(f"📎 {self.file_path.name}")
-            else:
-                lines.append(f"🔗 {self.source}")
-            lines.append("")
+        w(f"📌 {self.title_en or self.title}\n\n")
+        w(date_line)
+        summary_en = self.summary_en or self.summary
+        if summary_en:
+            w(f"📝 {summary_en}\n\n")
+        w(source_line)
 
         # English tags
-        en_tags = self._get_english_tags()
         if en_tags:
-            lines.append(f"🏷️ {' '.join(en_tags)}")
+            w(f"🏷️ {' '.join(en_tags)}\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()[:-1]
 
 
 class BaseProcessor(ABC):
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Union
 
-from .base import ProcessedContent
-from .link import LinkProcessor, extract_urls
+from ..util import bounded_gather
+from .base import ProcessedContent, clean_path, expand_path
+from .link import LinkProcessor, extract_url_spans
 from .file import FileProcessor
 from .text import TextProcessor
 
@@ -14,34 +16,18 @@ class UnsupportedFileError(Exception):
     pass
 
 
-def _clean_path(input_str: str) -> str:
-    """Clean file path from drag-drop artifacts."""
-    input_str = input_str.strip()
-
-    # Remove quotes
-    if (input_str.startswith("'") and input_str.endswith("'")) or \
-       (input_str.startswith('"') and input_str.endswith('"')):
-        input_str = input_str[1:-1]
-
-    # Handle escaped spaces
-    input_str = input_str.replace("\\ ", " ")
-
-    return input_str
-
-
 def _is_file_path(input_str: str) -> tuple[bool, Path | None]:
     """Check if input looks like a file path."""
-    cleaned = _clean_path(input_str)
+    cleaned = clean_path(input_str)
 
-    if cleaned.startswith("http://") or cleaned.startswith("https://"):
+    if cleaned.startswith(("http://", "https://")):
         return False, None
 
     # Check if it looks like a path
-    if not (cleaned.startswith("/") or cleaned.startswith("~") or
-            cleaned.startswith("./") or "/" in cleaned):
+    if not (cleaned.startswith(("/", "~", "./")) or "/" in cleaned):
         return False, None
 
-    path = Path(cleaned).expanduser()
+    path = expand_path(input_str)
     if path.exists() and path.is_file():
         return True, path
 
@@ -68,14 +54,14 @@ async def detect_and_process(input_str: str) -> ProcessedContent:
     input_str = input_str.strip()
 
     # Check if it's a file path first (for better error messages)
+    # The path is stat'ed once here and handed to FileProcessor directly
     is_file, file_path = _is_file_path(input_str)
     if is_file and file_path:
-        file_processor = FileProcessor()
-        if await file_processor.can_process(input_str):
-            return await file_processor.process(input_str)
+        suffix = file_path.suffix.lower()
+        if suffix in FileProcessor.SUPPORTED_SUFFIXES:
+            return await FileProcessor().process_path(file_path.resolve())
         else:
             # File exists but not supported
-            suffix = file_path.suffix.lower()
             supported = ", ".join(FileProcessor.SUPPORTED_EXTENSIONS.keys())
             raise UnsupportedFileError(
                 f"不支持的文件类型: {suffix}\n"
@@ -89,12 +75,12 @@ async def detect_and_process(input_str: str) -> ProcessedContent:
         return await link_processor.process(input_str)
 
     # Check if there's a URL embedded in text
-    urls = extract_urls(input_str)
-    if urls:
+    spans = extract_url_spans(input_str)
+    if spans:
         # Extract the first URL and process it
-        url = urls[0]
-        # Get the extra text (context) by removing the URL
-        extra_text = input_str.replace(url, "").strip()
+        url, start, end = spans[0]
+        # Get the extra text (context) by cutting the URL out by position
+        extra_text = (input_str[:start] + input_str[end:]).strip()
 
         # Process the URL
         content = await link_processor.process(url)
@@ -110,6 +96,30 @@ async def detect_and_process(input_str: str) -> ProcessedContent:
     return await text_processor.process(input_str)
 
 
+async def detect_and_process_many(
+    inputs: list[str], concurrency: int = 8
+) -> list[Union[ProcessedContent, Exception]]:
+    """Process several inputs concurrently.
+
+    At most `concurrency` inputs are fetched at once. Failures are returned
+    in place of their result so one bad input doesn't discard the others.
+
+    Args:
+        inputs: User inputs (URLs, file paths, or text)
+        concurrency: Maximum number of inputs processed at the same time
+
+    Returns:
+        Processed content or the raised exception, in input order
+    """
+    async def process_one(input_str: str) -> Union[ProcessedContent, Exception]:
+        try:
+            return await detect_and_process(input_str)
+        except Exception as e:
+            return e
+
+    return await bounded_gather(process_one, inputs, concurrency)
+
+
 def detect_input_type(input_str: str) -> str:
     """Quickly detect the input type without processing.
 
@@ -125,8 +135,7 @@ def detect_input_type(input_str: str) -> str:
     # Check for file path
     is_file, file_path = _is_file_path(input_str)
     if is_file and file_path:
-        suffix = file_path.suffix.lower()
-        if suffix in FileProcessor.SUPPORTED_EXTENSIONS:
+        if file_path.suffix.lower() in FileProcessor.SUPPORTED_SUFFIXES:
             return "file"
         else:
             return "unsupported_file"
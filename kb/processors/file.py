@@ -1,6 +1,7 @@
 """File processor for PDFs, images, and other files."""
 from __future__ import annotations
 
+import hashlib
 import mimetypes
 from pathlib import Path
 from typing import Optional
@@ -9,7 +10,27 @@ from pypdf import PdfReader
 from PIL import Image
 import io
 
-from .base import BaseProcessor, ProcessedContent, ContentType
+from ..config import get_config_dir
+from ..llm_cache import LLMCache
+from ..util import to_thread_fast
+from .base import BaseProcessor, ProcessedContent, ContentType, clean_path, expand_path
+
+
+# Limit on extracted text passed on for LLM summarization
+MAX_CONTENT_CHARS = 10000
+
+# Bump when PDF extraction changes so cached results are not reused
+PDF_EXTRACT_VERSION = "pdf-v1"
+
+_pdf_cache: Optional[LLMCache] = None
+
+
+def _get_pdf_cache() -> LLMCache:
+    """Get the disk cache of extracted PDF text, keyed by file content hash."""
+    global _pdf_cache
+    if _pdf_cache is None:
+        _pdf_cache = LLMCache(cache_dir=get_config_dir() / "cache" / "pdf", ttl=30 * 24 * 3600)
+    return _pdf_cache
 
 
 class FileProcessor(BaseProcessor):
@@ -26,84 +47,59 @@ class FileProcessor(BaseProcessor):
         ".webp": ContentType.IMAGE,
         ".bmp": ContentType.IMAGE,
     }
+    SUPPORTED_SUFFIXES = frozenset(SUPPORTED_EXTENSIONS)
 
     async def can_process(self, input_str: str) -> bool:
         """Check if input is a valid file path."""
-        input_str = input_str.strip()
-
-        # Remove quotes that might come from drag-drop
-        if (input_str.startswith("'") and input_str.endswith("'")) or \
-           (input_str.startswith('"') and input_str.endswith('"')):
-            input_str = input_str[1:-1]
-
-        # Handle escaped spaces from drag-drop
-        input_str = input_str.replace("\\ ", " ")
+        cleaned = clean_path(input_str)
 
         # Check if it looks like a file path
-        if input_str.startswith("http://") or input_str.startswith("https://"):
+        if cleaned.startswith(("http://", "https://")):
             return False
 
         # Check if it looks like a file path (starts with / or ~ or contains path separators)
-        if not (input_str.startswith("/") or input_str.startswith("~") or
-                input_str.startswith("./") or "/" in input_str or "\\" in input_str):
+        if not (cleaned.startswith(("/", "~", "./")) or "/" in cleaned or "\\" in cleaned):
             return False
 
-        path = Path(input_str).expanduser()
+        path = expand_path(input_str)
         if not path.exists():
             return False
 
         suffix = path.suffix.lower()
-        return suffix in self.SUPPORTED_EXTENSIONS
+        return suffix in self.SUPPORTED_SUFFIXES
 
     def is_file_path(self, input_str: str) -> bool:
         """Check if input looks like a file path (even if unsupported)."""
-        input_str = input_str.strip()
-
-        # Remove quotes
-        if (input_str.startswith("'") and input_str.endswith("'")) or \
-           (input_str.startswith('"') and input_str.endswith('"')):
-            input_str = input_str[1:-1]
-
-        input_str = input_str.replace("\\ ", " ")
-
-        if input_str.startswith("http://") or input_str.startswith("https://"):
+        if clean_path(input_str).startswith(("http://", "https://")):
             return False
 
-        path = Path(input_str).expanduser()
+        path = expand_path(input_str)
         return path.exists() and path.is_file()
 
     async def process(self, input_str: str) -> ProcessedContent:
         """Process a local file."""
-        input_str = input_str.strip()
-
-        # Remove quotes that might come from drag-drop
-        if (input_str.startswith("'") and input_str.endswith("'")) or \
-           (input_str.startswith('"') and input_str.endswith('"')):
-            input_str = input_str[1:-1]
-
-        # Handle escaped spaces from drag-drop
-        input_str = input_str.replace("\\ ", " ")
-
-        path = Path(input_str).expanduser().resolve()
+        path = expand_path(input_str).resolve()
 
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
 
+        return await self.process_path(path)
+
+    async def process_path(self, path: Path) -> ProcessedContent:
+        """Process a resolved path already known to be an existing file."""
         suffix = path.suffix.lower()
         content_type = self.SUPPORTED_EXTENSIONS.get(suffix, ContentType.FILE)
         mime_type, _ = mimetypes.guess_type(str(path))
 
-        # Read file
-        with open(path, "rb") as f:
-            raw_data = f.read()
+        file_size = path.stat().st_size
 
-        file_size = len(raw_data)
-
-        # Process based on type
+        # Process based on type. Only PDFs need the bytes in memory; raw
+        # data is otherwise loaded on demand via ProcessedContent.load_raw_data
         if content_type == ContentType.PDF:
+            raw_data = await to_thread_fast(path.read_bytes)
             content, title = await self._process_pdf(path, raw_data)
         elif content_type == ContentType.IMAGE:
-            content, title = await self._process_image(path, raw_data)
+            content, title = await self._process_image(path)
         else:
             content = ""
             title = path.stem
@@ -112,14 +108,26 @@ class FileProcessor(BaseProcessor):
             content_type=content_type,
             title=title or path.stem,
             source=str(path),
-            content=content[:10000],  # Limit for LLM
+            content=content,  # Already bounded to MAX_CONTENT_CHARS
             file_path=path,
             file_size=file_size,
             mime_type=mime_type,
-            raw_data=raw_data,
         )
 
     async def _process_pdf(self, path: Path, raw_data: bytes) -> tuple[str, str]:
+        """Extract text from PDF in a worker thread, reusing earlier results for the same bytes."""
+        cache = _get_pdf_cache()
+        digest = await to_thread_fast(lambda: hashlib.sha256(raw_data).hexdigest())
+        key = cache.make_key("pdf", str(MAX_CONTENT_CHARS), PDF_EXTRACT_VERSION, digest)
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached["content"], cached["title"]
+
+        content, title = await to_thread_fast(self._process_pdf_sync, path, raw_data)
+        await cache.put(key, {"content": content, "title": title})
+        return content, title
+
+    def _process_pdf_sync(self, path: Path, raw_data: bytes) -> tuple[str, str]:
         """Extract text from PDF."""
         reader = PdfReader(io.BytesIO(raw_data))
 
@@ -128,23 +136,33 @@ class FileProcessor(BaseProcessor):
         if reader.metadata:
             title = reader.metadata.get("/Title", "") or ""
 
-        # Extract text from all pages
+        # Extract page text until the LLM content limit is reached; the rest
+        # of a long document would be thrown away anyway
         text_parts = []
+        total = 0
         for page in reader.pages:
             text = page.extract_text()
             if text:
                 text_parts.append(text)
+                total += len(text) + 2
+                if total >= MAX_CONTENT_CHARS:
+                    break
 
-        content = "\n\n".join(text_parts)
+        content = "\n\n".join(text_parts)[:MAX_CONTENT_CHARS]
 
         return content, title
 
-    async def _process_image(self, path: Path, raw_data: bytes) -> tuple[str, str]:
+    async def _process_image(self, path: Path) -> tuple[str, str]:
+        """Process image file in a worker thread."""
+        return await to_thread_fast(self._process_image_sync, path)
+
+    def _process_image_sync(self, path: Path) -> tuple[str, str]:
         """Process image file."""
-        # Get basic image info
-        img = Image.open(io.BytesIO(raw_data))
-        width, height = img.size
-        format_name = img.format or path.suffix.upper().replace(".", "")
+        # Get basic image info; opening only parses the header, pixels are
+        # never decoded
+        with Image.open(path) as img:
+            width, height = img.size
+            format_name = img.format or path.suffix.upper().replace(".", "")
 
         # Create a description for context
         content = f"Image: {path.name}\nFormat: {format_name}\nSize: {width}x{height} pixels"
@@ -1,25 +1,58 @@
 """Link processor for web pages."""
 from __future__ import annotations
 
-import json
+import asyncio
 import re
+from dataclasses import replace
+from html.parser import HTMLParser
+from typing import Optional
 from urllib.parse import urlparse
 
 import httpx
 import trafilatura
 
+from ..util import TTLCache, json_loads, normalize_url
 from .base import BaseProcessor, ProcessedContent, ContentType
 
 
-# Zhihu-specific headers to bypass anti-scraping
+# Zhihu-specific headers to bypass anti-scraping. Accept-Encoding is left to
+# httpx, which advertises br/zstd only when their decoders are installed.
 ZHIHU_HEADERS = {
     "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "zh-CN,zh-Hans;q=0.9",
-    "Accept-Encoding": "gzip, deflate, br",
     "Connection": "keep-alive",
 }
 
+# Text of Zhihu's anti-bot verification page ("security verification")
+_ZHIHU_CAPTCHA_MARKER = "安全验证".encode("utf-8")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+}
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared page-fetching client, keeping connections alive across links."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared page-fetching client."""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
 
 # Pattern to find URLs anywhere in text
 URL_FINDER_PATTERN = re.compile(
@@ -33,21 +66,169 @@ URL_FINDER_PATTERN = re.compile(
 )
 
 
-def extract_urls(text: str) -> list[str]:
-    """Extract all URLs from text."""
-    urls = URL_FINDER_PATTERN.findall(text)
+# Patterns still applied to text the page scan has already isolated
+_ARXIV_ID_PREFIX_RE = re.compile(r'^\[\d+\.\d+\]\s*')
+_ARXIV_SUBMITTED_RE = re.compile(r'Submitted\s+on\s+(\d{1,2}\s+\w+\s+\d{4})', re.IGNORECASE)
+_DAY_MONTH_YEAR_RE = re.compile(r'(\d{1,2}\s+\w+\s+\d{4})')
+_ZHIHU_RICHTEXT_RE = re.compile(r'<span[^>]*class="RichText[^"]*"[^>]*>(.*?)</span>', re.DOTALL)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+
+# Page fields each extractor reads; a scan stops once all of them are found
+_ARXIV_FIELDS = frozenset({"meta", "h1_title", "dateline"})
+_ZHIHU_FIELDS = frozenset({"meta", "jsonld", "initial_data"})
+_TITLE_FIELDS = frozenset({"title"})
+
+
+class _ScanComplete(Exception):
+    """Raised by _PageScanner to stop once every requested field is found."""
+
+
+class _PageScanner(HTMLParser):
+    """Collects the metadata the site-specific extractors need in one pass."""
+
+    def __init__(self, fields: frozenset[str]):
+        super().__init__(convert_charrefs=True)
+        self.page = {
+            "meta": {},  # lowercased name/property -> content, first wins
+            "title": "",
+            "h1_title": "",
+            "dateline": "",
+            "jsonld": [],
+            "initial_data": "",
+        }
+        self._field: Optional[str] = None
+        self._field_tag = ""
+        self._parts: list[str] = []
+        # Fields still wanted; "meta" and "title" are complete at </head>
+        self._pending = set(fields)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        attributes = dict(attrs)
+        if tag == "meta":
+            key = attributes.get("name") or attributes.get("property")
+            content = attributes.get("content")
+            if key and content:
+                self.page["meta"].setdefault(key.lower(), content)
+            return
+
+        if self._field is not None:
+            return
+
+        page = self.page
+        css_class = attributes.get("class") or ""
+        if tag == "title" and not page["title"]:
+            self._start("title", tag)
+        elif tag == "script":
+            if (attributes.get("type") or "").lower() == "application/ld+json":
+                self._start("jsonld", tag)
+            elif attributes.get("id") == "js-initialData" and not page["initial_data"]:
+                self._start("initial_data", tag)
+        elif tag == "h1" and css_class.startswith("title") and not page["h1_title"]:
+            self._start("h1_title", tag)
+        elif css_class == "dateline" and not page["dateline"]:
+            self._start("dateline", tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            self._found("meta")
+            self._found("title")
+            return
+        if self._field is None or tag != self._field_tag:
+            return
+        field_name = self._field
+        self._field = None
+        text = "".join(self._parts).strip()
+        if field_name == "jsonld":
+            if not text:
+                return
+            self.page["jsonld"].append(text)
+        else:
+            self.page[field_name] = text
+        self._found(field_name)
+
+    def handle_data(self, data: str) -> None:
+        if self._field is not None:
+            self._parts.append(data)
+
+    def _start(self, field_name: str, tag: str) -> None:
+        self._field = field_name
+        self._field_tag = tag
+        self._parts = []
+
+    def _found(self, field_name: str) -> None:
+        self._pending.discard(field_name)
+        if not self._pending:
+            raise _ScanComplete
+
+
+def _parse_html_once(html: str, fields: frozenset[str]) -> dict:
+    """Scan a page once for the given fields among meta tags, <title>,
+    h1.title, dateline and data scripts.
+
+    The scan stops as soon as every requested field is found, so e.g. a
+    title lookup reads only the start of <head> rather than the whole body.
+    """
+    scanner = _PageScanner(fields)
+    try:
+        scanner.feed(html)
+        scanner.close()
+    except _ScanComplete:
+        pass
+    return scanner.page
+
+
+# Punctuation that ends a sentence rather than the URL before it
+_URL_TRAILING_PUNCT = '.,;:!?)'
+
+
+def extract_url_spans(text: str) -> list[tuple[str, int, int]]:
+    """Extract unique URLs from text with the (start, end) span of their first occurrence."""
+    # Every match contains "://"; one C-level substring scan lets plain text
+    # (e.g. long pastes) skip the regex entirely
+    if "://" not in text:
+        return []
+
+    # Fast path: the whole message is a single URL (the common bot case)
+    if text.startswith(("http://", "https://")) and text.count("://") == 1 \
+            and " " not in text and "\n" not in text:
+        match = URL_FINDER_PATTERN.match(text)
+        if match and match.end() == len(text):
+            url = text.rstrip(_URL_TRAILING_PUNCT) if text[-1] in _URL_TRAILING_PUNCT else text
+            return [(url, 0, len(url))]
+
     # Deduplicate while preserving order
     seen = set()
     result = []
-    for url in urls:
+    for match in URL_FINDER_PATTERN.finditer(text):
         # Clean trailing punctuation
-        url = url.rstrip('.,;:!?)')
+        url = match.group(0)
+        if url[-1] in _URL_TRAILING_PUNCT:
+            url = url.rstrip(_URL_TRAILING_PUNCT)
         if url not in seen:
             seen.add(url)
-            result.append(url)
+            start = match.start()
+            result.append((url, start, start + len(url)))
     return result
 
 
+def extract_urls(text: str) -> list[str]:
+    """Extract all URLs from text."""
+    return [url for url, _, _ in extract_url_spans(text)]
+
+
+# Fetches in progress, keyed by input URL, so concurrent requests for the same
+# page share one download and parse
+_inflight: dict[str, asyncio.Task] = {}
+
+# Recently parsed pages, keyed by normalized URL, so re-shared links skip the
+# fetch and parse entirely
+_page_cache = TTLCache(maxsize=512, ttl=3600)
+
+# Cap on downloaded page size; larger pages are parsed from their first bytes
+MAX_HTML_BYTES = 2 * 1024 * 1024
+
+
 class LinkProcessor(BaseProcessor):
     """Processor for web links/URLs."""
 
@@ -64,17 +245,41 @@ class LinkProcessor(BaseProcessor):
     def __init__(self, timeout: float = 30.0):
         self.timeout = timeout
 
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (connections are pooled across instances)."""
+        await close_http_client()
+
     async def can_process(self, input_str: str) -> bool:
         """Check if input is a valid URL."""
         input_str = input_str.strip()
+        # Cheap scheme check first so plain text never reaches the regex
+        # (the pattern is case-insensitive, hence lower())
+        if not input_str[:8].lower().startswith(("http://", "https://")):
+            return False
         return bool(self.URL_PATTERN.match(input_str))
 
     async def process(self, input_str: str) -> ProcessedContent:
-        """Fetch and process a web page."""
-        url = input_str.strip()
-
+        """Fetch and process a web page, joining an identical fetch in progress."""
         # Handle ArXiv PDF URLs - convert to abstract page
-        url, original_url = self._normalize_arxiv_url(url)
+        url, original_url = self._normalize_arxiv_url(input_str.strip())
+
+        # Each caller gets its own copy since the result is edited downstream
+        cached = _page_cache.get(normalize_url(url))
+        if cached is not None:
+            return replace(cached, source=original_url, tags=[])
+
+        task = _inflight.get(original_url)
+        if task is None:
+            task = asyncio.ensure_future(self._process(url, original_url))
+            _inflight[original_url] = task
+            task.add_done_callback(lambda _: _inflight.pop(original_url, None))
+
+        # Shielded so one caller being cancelled doesn't fail the others
+        content = await asyncio.shield(task)
+        return replace(content, tags=list(content.tags))
+
+    async def _process(self, url: str, original_url: str) -> ProcessedContent:
+        """Fetch and process a web page."""
 
         parsed_url = urlparse(url)
         source = parsed_url.netloc
@@ -82,38 +287,22 @@ class LinkProcessor(BaseProcessor):
         # Check if it's a Zhihu URL
         is_zhihu = "zhihu.com" in url
 
-        # Select appropriate headers
-        if is_zhihu:
-            headers = ZHIHU_HEADERS
-        else:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            }
-
-        # Fetch the page
-        async with httpx.AsyncClient(
+        # Fetch the page over the shared client, reading at most
+        # MAX_HTML_BYTES of the body (content is truncated for the LLM anyway)
+        async with _get_http_client().stream(
+            "GET",
+            url,
+            headers=ZHIHU_HEADERS if is_zhihu else DEFAULT_HEADERS,
             timeout=self.timeout,
-            follow_redirects=True,
-            headers=headers
-        ) as client:
-            response = await client.get(url)
+        ) as response:
+            # Handle Zhihu anti-scraping (403)
+            if is_zhihu and response.status_code == 403:
+                return self._zhihu_blocked(original_url)
 
-            # Handle Zhihu anti-scraping (403 or CAPTCHA)
-            if is_zhihu and (response.status_code == 403 or "安全验证" in response.text):
-                # Return with explanation - Zhihu has strong anti-bot protection
-                return ProcessedContent(
-                    content_type=ContentType.LINK,
-                    title="知乎链接 (需要手动复制内容)",
-                    source=original_url,
-                    content="知乎有严格的反爬虫保护，无法自动抓取内容。请手动复制文章内容后使用文本模式输入。",
-                )
-
-            response.raise_for_status()
-
-            # Check content type - if PDF, we can't parse it as HTML
+            # Check content type - if PDF, we can't parse it as HTML, so
+            # return basic info without downloading the body
             content_type = response.headers.get("content-type", "")
-            if "pdf" in content_type.lower():
-                # Return basic info for PDF
+            if response.is_success and "pdf" in content_type.lower():
                 return ProcessedContent(
                     content_type=ContentType.LINK,
                     title=original_url,
@@ -121,38 +310,69 @@ class LinkProcessor(BaseProcessor):
                     content="PDF document",
                 )
 
-            html = response.text
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= MAX_HTML_BYTES:
+                    break
+
+            # Handle Zhihu anti-scraping (CAPTCHA page), checked on the raw
+            # UTF-8 bytes so a blocked page is never decoded
+            if is_zhihu and _ZHIHU_CAPTCHA_MARKER in body:
+                return self._zhihu_blocked(original_url)
+
+            response.raise_for_status()
+
+            try:
+                html = body.decode(response.charset_encoding or "utf-8", errors="replace")
+            except LookupError:
+                html = body.decode("utf-8", errors="replace")
 
-        # Extract content using trafilatura
-        extracted = trafilatura.extract(
+        # Extract content and metadata using trafilatura, from a single parse
+        doc = trafilatura.bare_extraction(
             html,
+            with_metadata=True,
             include_comments=False,
             include_tables=True,
-            no_fallback=False,
+            fast=False,  # keep the readability/justext fallbacks
         )
-
-        # Get metadata
-        metadata = trafilatura.extract_metadata(html)
+        # trafilatura 2.x returns a Document rather than a dict
+        if doc is not None:
+            doc = doc.as_dict()
 
         title = ""
         publish_date = ""
-        if metadata:
-            title = metadata.title or ""
+        if doc:
+            extracted = doc.get("text")
+            title = doc.get("title") or ""
             # Extract date from metadata
-            publish_date = metadata.date or ""
+            publish_date = doc.get("date") or ""
+        else:
+            # No main text found; metadata may still be available
+            extracted = None
+            metadata = trafilatura.extract_metadata(html)
+            if metadata:
+                title = metadata.title or ""
+                publish_date = metadata.date or ""
+
+        # Metadata for the site-specific extractors comes from a single scan
+        # of the page, done only when one of them needs it
+        page: Optional[dict] = None
 
         # Special handling for ArXiv - extract title and date
         if "arxiv.org" in url:
-            arxiv_title = self._extract_arxiv_title(html)
+            page = _parse_html_once(html, _ARXIV_FIELDS)
+            arxiv_title = self._extract_arxiv_title(page)
             if arxiv_title:
                 title = arxiv_title
-            arxiv_date = self._extract_arxiv_date(html)
+            arxiv_date = self._extract_arxiv_date(page, html)
             if arxiv_date:
                 publish_date = arxiv_date
 
         # Special handling for Zhihu - extract title, content, and date
         if is_zhihu:
-            zhihu_data = self._extract_zhihu_content(html, url)
+            page = page or _parse_html_once(html, _ZHIHU_FIELDS)
+            zhihu_data = self._extract_zhihu_content(page, html)
             if zhihu_data.get("title"):
                 title = zhihu_data["title"]
             if zhihu_data.get("content"):
@@ -162,18 +382,35 @@ class LinkProcessor(BaseProcessor):
 
         # Fallback title extraction
         if not title:
-            title = self._extract_title_from_html(html) or url
+            # Scans that wanted "meta" read all of <head>, so they have <title>
+            page = page or _parse_html_once(html, _TITLE_FIELDS)
+            title = page["title"] or url
 
         content = extracted or ""
 
         # Use original URL as source (e.g., keep arxiv.org/pdf/... if that was input)
-        return ProcessedContent(
+        result = ProcessedContent(
             content_type=ContentType.LINK,
             title=title,
             source=original_url,
             content=content[:10000],  # Limit content length for LLM
             publish_date=publish_date if publish_date else None,
         )
+        # Only fully parsed pages are cached; Zhihu blocks, PDF stubs and
+        # pages whose text came out empty are retried on the next request
+        if content:
+            _page_cache[normalize_url(url)] = result
+        return result
+
+    @staticmethod
+    def _zhihu_blocked(original_url: str) -> ProcessedContent:
+        """Explain that Zhihu refused the fetch - it has strong anti-bot protection."""
+        return ProcessedContent(
+            content_type=ContentType.LINK,
+            title="知乎链接 (需要手动复制内容)",
+            source=original_url,
+            content="知乎有严格的反爬虫保护，无法自动抓取内容。请手动复制文章内容后使用文本模式输入。",
+        )
 
     def _normalize_arxiv_url(self, url: str) -> tuple[str, str]:
         """Convert ArXiv PDF URL to abstract URL for better parsing.
@@ -192,76 +429,58 @@ class LinkProcessor(BaseProcessor):
 
         return url, original_url
 
-    def _extract_arxiv_title(self, html: str) -> str:
-        """Extract paper title from ArXiv page."""
-        import re
+    def _extract_arxiv_title(self, page: dict) -> str:
+        """Extract paper title from a scanned ArXiv page."""
+        meta = page["meta"]
 
         # Try meta tag first (most reliable)
         # <meta name="citation_title" content="...">
-        match = re.search(r'<meta\s+name="citation_title"\s+content="([^"]+)"', html, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+        title = meta.get("citation_title", "").strip()
+        if title:
+            return title
 
         # Try og:title meta tag
-        match = re.search(r'<meta\s+property="og:title"\s+content="([^"]+)"', html, re.IGNORECASE)
-        if match:
-            title = match.group(1).strip()
+        title = meta.get("og:title", "").strip()
+        if title:
             # Remove "[XXXX.XXXXX]" prefix if present
-            title = re.sub(r'^\[\d+\.\d+\]\s*', '', title)
-            return title
+            return _ARXIV_ID_PREFIX_RE.sub('', title)
 
         # Try h1.title class (ArXiv abstract page structure)
-        match = re.search(r'<h1[^>]*class="title[^"]*"[^>]*>(?:<span[^>]*>Title:</span>)?\s*([^<]+)', html, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-
-        return ""
-
-    def _extract_arxiv_date(self, html: str) -> str:
-        """Extract submission/publication date from ArXiv page."""
-        import re
-
-        # Try citation_date meta tag (format: YYYY/MM/DD)
-        match = re.search(r'<meta\s+name="citation_date"\s+content="([^"]+)"', html, re.IGNORECASE)
-        if match:
-            date_str = match.group(1).strip()
+        title = page["h1_title"]
+        if title.startswith("Title:"):
+            title = title[len("Title:"):].strip()
+        return title
+
+    def _extract_arxiv_date(self, page: dict, html: str) -> str:
+        """Extract submission/publication date from a scanned ArXiv page."""
+        meta = page["meta"]
+
+        # Try citation_date, then citation_online_date (format: YYYY/MM/DD)
+        date_str = (meta.get("citation_date") or meta.get("citation_online_date") or "").strip()
+        if date_str:
             # Convert YYYY/MM/DD to YYYY-MM-DD
             return date_str.replace("/", "-")
 
-        # Try citation_online_date
-        match = re.search(r'<meta\s+name="citation_online_date"\s+content="([^"]+)"', html, re.IGNORECASE)
-        if match:
-            date_str = match.group(1).strip()
-            return date_str.replace("/", "-")
+        # Try dateline class, e.g. "[Submitted on 2 Dec 2024]"
+        date_match = _DAY_MONTH_YEAR_RE.search(page["dateline"])
+        if date_match:
+            return date_match.group(1)
 
-        # Try to find "Submitted on DD Mon YYYY" pattern
-        match = re.search(r'Submitted\s+on\s+(\d{1,2}\s+\w+\s+\d{4})', html, re.IGNORECASE)
+        # Try to find "Submitted on DD Mon YYYY" anywhere in the page
+        match = _ARXIV_SUBMITTED_RE.search(html)
         if match:
             return match.group(1)
 
-        # Try dateline class
-        match = re.search(r'class="dateline"[^>]*>([^<]+)<', html, re.IGNORECASE)
-        if match:
-            dateline = match.group(1).strip()
-            # Extract date from "Submitted on 2 Dec 2024"
-            date_match = re.search(r'(\d{1,2}\s+\w+\s+\d{4})', dateline)
-            if date_match:
-                return date_match.group(1)
-
         return ""
 
-    def _extract_zhihu_content(self, html: str, url: str) -> dict:
-        """Extract content from Zhihu page."""
+    def _extract_zhihu_content(self, page: dict, html: str) -> dict:
+        """Extract content from a scanned Zhihu page."""
         result = {"title": "", "content": "", "date": "", "author": ""}
 
         # Try to extract from JSON-LD script
-        json_ld_match = re.search(
-            r'<script[^>]*type="application/ld\+json"[^>]*>([^<]+)</script>',
-            html, re.IGNORECASE
-        )
-        if json_ld_match:
+        if page["jsonld"]:
             try:
-                data = json.loads(json_ld_match.group(1))
+                data = json_loads(page["jsonld"][0])
                 if isinstance(data, dict):
                     result["title"] = data.get("headline", "") or data.get("name", "")
                     result["content"] = data.get("articleBody", "") or data.get("text", "")
@@ -272,53 +491,50 @@ class LinkProcessor(BaseProcessor):
                             result["author"] = author.get("name", "")
                         elif isinstance(author, str):
                             result["author"] = author
-            except json.JSONDecodeError:
+            except ValueError:  # json and orjson decode errors
                 pass
 
         # Try to extract from initial data script (Zhihu stores data here)
-        initial_data_match = re.search(
-            r'<script[^>]*id="js-initialData"[^>]*>([^<]+)</script>',
-            html, re.IGNORECASE
-        )
-        if initial_data_match and not result["content"]:
+        if page["initial_data"] and not result["content"]:
             try:
-                data = json.loads(initial_data_match.group(1))
+                # js-initialData is often hundreds of KB; json_loads uses
+                # orjson when installed
+                data = json_loads(page["initial_data"])
                 # Navigate the complex Zhihu data structure
                 if "initialState" in data:
                     state = data["initialState"]
                     # Extract answer content
                     if "entities" in state and "answers" in state["entities"]:
                         answers = state["entities"]["answers"]
-                        for answer_id, answer in answers.items():
-                            if not result["content"]:
-                                result["content"] = answer.get("content", "")
-                                result["date"] = answer.get("createdTime", "") or answer.get("updatedTime", "")
+                        for answer in answers.values():
+                            result["content"] = answer.get("content", "")
+                            result["date"] = answer.get("createdTime", "") or answer.get("updatedTime", "")
+                            if result["content"]:
+                                break
                     # Extract question title
-                    if "entities" in state and "questions" in state["entities"]:
+                    if not result["title"] and "entities" in state and "questions" in state["entities"]:
                         questions = state["entities"]["questions"]
-                        for q_id, question in questions.items():
-                            if not result["title"]:
-                                result["title"] = question.get("title", "")
-            except json.JSONDecodeError:
+                        for question in questions.values():
+                            result["title"] = question.get("title", "")
+                            if result["title"]:
+                                break
+            except ValueError:  # json and orjson decode errors
                 pass
 
         # Fallback: extract from HTML meta tags
         if not result["title"]:
-            og_title = re.search(r'<meta[^>]*property="og:title"[^>]*content="([^"]+)"', html, re.IGNORECASE)
-            if og_title:
-                result["title"] = og_title.group(1).strip()
+            result["title"] = page["meta"].get("og:title", "").strip()
 
         if not result["content"]:
             # Try to extract from RichText span
-            content_match = re.search(r'<span[^>]*class="RichText[^"]*"[^>]*>(.*?)</span>', html, re.DOTALL)
+            content_match = _ZHIHU_RICHTEXT_RE.search(html)
             if content_match:
-                # Remove HTML tags
-                content = re.sub(r'<[^>]+>', '', content_match.group(1))
-                result["content"] = content.strip()
+                result["content"] = content_match.group(1)
 
-        # Clean up content - remove HTML tags if present
+        # Clean up content - remove HTML tags if present (one pass, whichever
+        # source the content came from)
         if result["content"]:
-            result["content"] = re.sub(r'<[^>]+>', '', result["content"])
+            result["content"] = _HTML_TAG_RE.sub('', result["content"])
             result["content"] = result["content"].strip()
 
         # Format date if it's a timestamp
@@ -331,11 +547,3 @@ class LinkProcessor(BaseProcessor):
                 pass
 
         return result
-
-    def _extract_title_from_html(self, html: str) -> str:
-        """Extract title from HTML as fallback."""
-        import re
-        match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return ""
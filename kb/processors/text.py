@@ -16,14 +16,15 @@ class TextProcessor(BaseProcessor):
         """Process plain text content."""
         text = input_str.strip()
 
-        # Try to extract a title from the first line
-        lines = text.split("\n")
-        first_line = lines[0].strip()
+        # Try to extract a title from the first line, without splitting the
+        # whole (possibly very long) paste into lines
+        first_line, sep, rest = text.partition("\n")
+        first_line = first_line.strip()
 
         # Use first line as title if it's short enough
-        if len(first_line) <= 100 and len(lines) > 1:
+        if sep and len(first_line) <= 100:
             title = first_line
-            content = "\n".join(lines[1:]).strip()
+            content = rest.strip()
         else:
             # Generate a title from the beginning of the text
             title = text[:50] + "..." if len(text) > 50 else text
@@ -9,6 +9,7 @@ from telegram.constants import ParseMode
 
 from .config import Config
 from .processors.base import ProcessedContent, ContentType
+from .util import to_thread_fast
 
 
 class TelegramPublisher:
@@ -18,6 +19,18 @@ class TelegramPublisher:
         self.config = config
         self.bot = Bot(token=config.telegram.bot_token)
         self.channel_id = config.telegram.channel_id
+        self._message_url_prefix = self._build_message_url_prefix(str(self.channel_id))
+
+    @staticmethod
+    def _build_message_url_prefix(channel: str) -> str:
+        """Get the t.me URL prefix of messages in the channel."""
+        if channel.startswith("@"):
+            return f"https://t.me/{channel[1:]}/"
+        # For private channels with numeric ID
+        # Remove -100 prefix if present
+        if channel.startswith("-100"):
+            channel = channel[4:]
+        return f"https://t.me/c/{channel}/"
 
     async def publish(self, content: ProcessedContent) -> str:
         """Publish content to Telegram channel.
@@ -50,39 +63,32 @@ class TelegramPublisher:
 
     async def _publish_image(self, content: ProcessedContent, caption: str) -> str:
         """Publish image with caption."""
-        with open(content.file_path, "rb") as f:
-            message = await self.bot.send_photo(
-                chat_id=self.channel_id,
-                photo=f,
-                caption=caption,
-                parse_mode=ParseMode.MARKDOWN,
-            )
+        # Read the file in a worker thread so the event loop isn't blocked
+        data = await to_thread_fast(content.load_raw_data)
+        message = await self.bot.send_photo(
+            chat_id=self.channel_id,
+            photo=data,
+            caption=caption,
+            parse_mode=ParseMode.MARKDOWN,
+            filename=content.file_path.name,
+        )
         return self._get_message_url(message.message_id)
 
     async def _publish_document(self, content: ProcessedContent, caption: str) -> str:
         """Publish document with caption."""
-        with open(content.file_path, "rb") as f:
-            message = await self.bot.send_document(
-                chat_id=self.channel_id,
-                document=f,
-                caption=caption,
-                parse_mode=ParseMode.MARKDOWN,
-            )
+        data = await to_thread_fast(content.load_raw_data)
+        message = await self.bot.send_document(
+            chat_id=self.channel_id,
+            document=data,
+            caption=caption,
+            parse_mode=ParseMode.MARKDOWN,
+            filename=content.file_path.name,
+        )
         return self._get_message_url(message.message_id)
 
     def _get_message_url(self, message_id: int) -> str:
         """Get URL to the published message."""
-        channel = self.channel_id
-        if channel.startswith("@"):
-            channel_name = channel[1:]
-            return f"https://t.me/{channel_name}/{message_id}"
-        else:
-            # For private channels with numeric ID
-            # Remove -100 prefix if present
-            channel_id = str(channel)
-            if channel_id.startswith("-100"):
-                channel_id = channel_id[4:]
-            return f"https://t.me/c/{channel_id}/{message_id}"
+        return f"{self._message_url_prefix}{message_id}"
 
     async def test_connection(self) -> bool:
         """Test connection to Telegram.
@@ -1,10 +1,113 @@
 """Tag system for content categorization."""
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import re
+from functools import lru_cache
+from typing import Callable, Optional
 
-from .config import Config, add_preset_tag, load_config
-from .llm import BaseLLM
+from .config import Config, add_preset_tag, add_preset_tags
+from .llm import BaseLLM, TAG_CONTENT_LIMIT
+from .util import json_loads
+
+# tiktoken is optional; without it tag prompts fall back to a character limit
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Upper bound on characters per token, so only a bounded prefix is encoded
+_MAX_CHARS_PER_TOKEN = 8
+
+# Tag separators: LLM output may use full-width commas, user input doesn't
+_TAG_SPLIT_RE = re.compile(r'[,，\s]+')
+_USER_TAG_SPLIT_RE = re.compile(r'[,\s]+')
+
+# Maps the full-width colon LLMs often emit in Chinese output to ":"
+_FULLWIDTH_COLON = str.maketrans({"：": ":"})
+
+# System prompts hold only session-stable text (instructions and the preset
+# list) so providers can cache the prefix; per-call values such as the tag
+# count go in the user message.
+EXTRA_TAGS_PROMPT = """你是一个标签生成助手。为内容生成具体、可搜索的标签。
+
+规则:
+1. 生成具体的标签，如技术名称、产品名、概念等
+2. 使用英文或中文单词，不要有空格
+3. 标签要便于搜索，例如: LLM, GPT4, RAG, Agent, Python, 机器学习
+4. 不要重复这些已有标签: {tags_str}
+5. 直接输出标签，用逗号分隔，不要解释"""
+
+TITLE_TAGS_PROMPT = """你是一个内容分类专家。根据标题判断内容类别并生成标签。
+
+预设标签: [{tags_str}]
+
+任务:
+1. 从预设标签中选择2-3个最相关的
+2. 额外生成3-5个具体的技术/概念标签
+
+输出 JSON 对象 (严格遵守，不要输出其他内容):
+{{"preset": ["tag1", "tag2"], "extra": ["tag1", "tag2", "tag3"]}}"""
+
+
+def _title_tags_from_json(raw: str) -> Optional[tuple[list[str], list[str]]]:
+    """Get (preset, extra) candidates from a JSON reply, or None if it isn't JSON."""
+    # Tolerate code fences or text around the object
+    start, end = raw.find("{"), raw.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        data = json_loads(raw[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    preset, extra = data.get("preset"), data.get("extra")
+    return (
+        [str(t) for t in preset] if isinstance(preset, list) else [],
+        [str(t) for t in extra] if isinstance(extra, list) else [],
+    )
+
+
+def _title_tags_from_lines(raw: str) -> tuple[list[str], list[str]]:
+    """Get (preset, extra) candidates from "预设: ..." / "额外: ..." lines."""
+    preset: list[str] = []
+    extra: list[str] = []
+    # Label -> target list; one dict lookup per line
+    sections = {"预设": preset, "额外": extra}
+    for line in raw.split("\n"):
+        # Normalize the full-width colon so one partition handles both
+        label, sep, tags_part = line.translate(_FULLWIDTH_COLON).partition(":")
+        target = sections.get(label.strip()) if sep else None
+        if target is not None:
+            target.extend(_TAG_SPLIT_RE.split(tags_part))
+    return preset, extra
+
+
+def _clean_tags(tags: list[str], seen: set[str], accept: Callable[[str], bool]) -> list[str]:
+    """Strip tags and keep the accepted ones not seen before, in order."""
+    result = []
+    for t in tags:
+        t = t.strip().strip('#')
+        if t and t not in seen and accept(t):
+            seen.add(t)
+            result.append(t)
+    return result
+
+
+@lru_cache(maxsize=1)
+def _load_encoding():
+    """Load the tiktoken encoding once, or None if tiktoken can't provide it.
+
+    tiktoken downloads the BPE file on first use, which fails offline.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
 
 
 class Tagger:
@@ -13,6 +116,41 @@ class Tagger:
     def __init__(self, config: Config, llm: Optional[BaseLLM] = None):
         self.config = config
         self.llm = llm
+        self._refresh_presets()
+
+    def _refresh_presets(self) -> None:
+        """Precompute preset tag lookups (call again after presets change)."""
+        self.preset_tags_set = frozenset(self.preset_tags)
+        self.preset_tags_top12 = tuple(self.preset_tags[:12])
+        self.preset_tags_lower = {t.lower(): t for t in self.preset_tags}
+        self.preset_tags_joined = ", ".join(self.preset_tags)
+        self.preset_tags_display = " | ".join(self.preset_tags)
+        self._extra_tags_system_prompt = EXTRA_TAGS_PROMPT.format(tags_str=self.preset_tags_joined)
+        self._title_tags_system_prompt = TITLE_TAGS_PROMPT.format(tags_str=self.preset_tags_joined)
+        # Longest first so e.g. "LLM" is not shadowed by a shorter preset;
+        # ASCII tags must stand alone, not inside a longer word. Only the
+        # exact preset spelling counts, so prose like "a design article"
+        # doesn't match "Design"/"Article".
+        literals = sorted(map(re.escape, self.preset_tags_set), key=len, reverse=True)
+        self._preset_literal_re = re.compile(
+            f"(?<![A-Za-z0-9])(?:{'|'.join(literals)})(?![A-Za-z0-9])"
+        ) if literals else None
+
+    def _truncate_for_prompt(self, text: str) -> str:
+        """Cut text to tags.max_prompt_tokens tokens (TAG_CONTENT_LIMIT chars without an encoding).
+
+        This is the only limit on tag prompt content; callers pass the full text.
+        """
+        # Loaded on first use, so a Tagger that never tags doesn't touch tiktoken
+        encoding = _load_encoding()
+        if encoding is None:
+            return text[:TAG_CONTENT_LIMIT]
+        max_tokens = self.config.tags.max_prompt_tokens
+        tokens = encoding.encode(text[:max_tokens * _MAX_CHARS_PER_TOKEN])
+        if len(tokens) <= max_tokens:
+            return text[:max_tokens * _MAX_CHARS_PER_TOKEN]
+        # A cut can split a multi-byte character across tokens
+        return encoding.decode(tokens[:max_tokens]).rstrip("\ufffd")
 
     @property
     def preset_tags(self) -> list[str]:
@@ -39,8 +177,20 @@ class Tagger:
         if not content.strip():
             return []
 
+        # Enough presets written out in the content: use them, skip the LLM
+        threshold = self.config.tags.literal_match_threshold
+        if threshold > 0 and self._preset_literal_re is not None:
+            hits = list(dict.fromkeys(self._preset_literal_re.findall(content)))
+            if len(hits) >= threshold:
+                return hits
+
         try:
-            return await self.llm.suggest_tags(content, self.preset_tags)
+            return await self.llm.suggest_tags(
+                self._truncate_for_prompt(content),
+                self.preset_tags,
+                self.preset_tags_lower,
+                max_chars=None,
+            )
         except Exception:
             return []
 
@@ -66,38 +216,60 @@ class Tagger:
             messages = [
                 {
                     "role": "system",
-                    "content": f"""你是一个标签生成助手。为内容生成{count}个具体、可搜索的标签。
-
-规则:
-1. 生成具体的标签，如技术名称、产品名、概念等
-2. 使用英文或中文单词，不要有空格
-3. 标签要便于搜索，例如: LLM, GPT4, RAG, Agent, Python, 机器学习
-4. 不要重复这些已有标签: {', '.join(self.preset_tags)}
-5. 直接输出标签，用逗号分隔，不要解释"""
+                    "content": self._extra_tags_system_prompt
                 },
                 {
                     "role": "user",
-                    "content": f"为以下内容生成{count}个标签：\n\n{content[:3000]}"
+                    "content": f"为以下内容生成{count}个标签：\n\n{self._truncate_for_prompt(content)}"
                 }
             ]
-            response = await self.llm.chat(messages)
-            raw_tags = response.content.strip()
-
-            # Parse tags
-            import re
-            tags = re.split(r'[,，\s]+', raw_tags)
             result = []
+            seen = set()
+            preset_set = self.preset_tags_set
 
-            for tag in tags:
+            def accept(tag: str) -> bool:
+                """Add a tag if usable; True once `count` tags are collected."""
                 tag = tag.strip().strip('#')
-                # Skip if empty, too long, or already in presets
-                if tag and len(tag) <= 30 and tag not in self.preset_tags:
+                # Skip if empty, too long, repeated, or already in presets
+                if tag and len(tag) <= 30 and tag not in preset_set and tag not in seen:
+                    seen.add(tag)
                     result.append(tag)
-
-            return result[:count]
+                return len(result) >= count
+
+            # Parse tags as the reply streams in and stop as soon as `count`
+            # are complete, instead of waiting for the whole generation
+            pending = ""
+            stream = self.llm.chat_stream(messages)
+            try:
+                async for chunk in stream:
+                    # The last piece may be a tag that is still being written
+                    *complete, pending = _TAG_SPLIT_RE.split(pending + chunk)
+                    if any(accept(tag) for tag in complete):
+                        break
+                else:
+                    accept(pending)
+            finally:
+                await stream.aclose()
         except Exception:
             return []
 
+        return result
+
+    async def suggest_all(self, content: str, extra_count: int = 5) -> tuple[list[str], list[str]]:
+        """Get preset and extra tag suggestions concurrently.
+
+        Prefer this over awaiting suggest_tags and generate_extra_tags one
+        after the other; both only depend on the content.
+
+        Returns:
+            Tuple of (suggested preset tags, extra tags)
+        """
+        suggested, extra = await asyncio.gather(
+            self.suggest_tags(content),
+            self.generate_extra_tags(content, extra_count),
+        )
+        return suggested, extra
+
     async def generate_tags_from_title(self, title: str, source: str = "") -> tuple[list[str], list[str]]:
         """Generate tags based on title and source when content is unavailable.
 
@@ -119,51 +291,29 @@ class Tagger:
             if source:
                 context += f"\n来源: {source}"
 
-            tags_str = ", ".join(self.preset_tags)
             messages = [
                 {
                     "role": "system",
-                    "content": f"""你是一个内容分类专家。根据标题判断内容类别并生成标签。
-
-预设标签: [{tags_str}]
-
-任务:
-1. 从预设标签中选择2-3个最相关的
-2. 额外生成3-5个具体的技术/概念标签
-
-输出格式 (严格遵守):
-预设: tag1, tag2
-额外: tag1, tag2, tag3"""
+                    "content": self._title_tags_system_prompt
                 },
                 {
                     "role": "user",
                     "content": context
                 }
             ]
-            response = await self.llm.chat(messages)
+            response = await self.llm.chat(messages, json_output=True)
             raw = response.content.strip()
 
-            # Parse response
-            import re
-            preset_tags = []
-            extra_tags = []
-
-            for line in raw.split("\n"):
-                line = line.strip()
-                if line.startswith("预设:") or line.startswith("预设："):
-                    tags_part = line.split(":", 1)[-1] if ":" in line else line.split("：", 1)[-1]
-                    tags = re.split(r'[,，\s]+', tags_part)
-                    for t in tags:
-                        t = t.strip().strip('#')
-                        if t and t in self.preset_tags:
-                            preset_tags.append(t)
-                elif line.startswith("额外:") or line.startswith("额外："):
-                    tags_part = line.split(":", 1)[-1] if ":" in line else line.split("：", 1)[-1]
-                    tags = re.split(r'[,，\s]+', tags_part)
-                    for t in tags:
-                        t = t.strip().strip('#')
-                        if t and len(t) <= 30 and t not in self.preset_tags:
-                            extra_tags.append(t)
+            # JSON mode reply; models without JSON mode may still answer in
+            # the older "预设: / 额外:" line format
+            preset_raw, extra_raw = _title_tags_from_json(raw) or _title_tags_from_lines(raw)
+
+            seen: set[str] = set()  # LLMs sometimes repeat a tag
+            preset_set = self.preset_tags_set
+            preset_tags = _clean_tags(preset_raw, seen, lambda t: t in preset_set)
+            extra_tags = _clean_tags(
+                extra_raw, seen, lambda t: len(t) <= 30 and t not in preset_set
+            )
 
             return preset_tags, extra_tags[:5]
         except Exception:
@@ -178,22 +328,14 @@ class Tagger:
         Returns:
             Tuple of (valid_tags, new_tags)
         """
-        valid_tags = []
-        new_tags = []
-
-        for tag in tags:
-            tag = tag.strip()
-            if not tag:
-                continue
-
-            # Remove # prefix if present
-            if tag.startswith("#"):
-                tag = tag[1:]
+        # Strip whitespace and "#" prefixes, dropping empties and repeats
+        cleaned = list(dict.fromkeys(t for tag in tags if (t := tag.strip().lstrip("#"))))
 
-            if tag in self.preset_tags:
-                valid_tags.append(tag)
-            else:
-                new_tags.append(tag)
+        valid_set = self.preset_tags_set.intersection(cleaned)
+        if len(valid_set) == len(cleaned):
+            return cleaned, []
+        valid_tags = [t for t in cleaned if t in valid_set]
+        new_tags = [t for t in cleaned if t not in valid_set]
 
         return valid_tags, new_tags
 
@@ -213,12 +355,13 @@ class Tagger:
         if tag.startswith("#"):
             tag = tag[1:]
 
-        if tag in self.preset_tags:
+        if tag in self.preset_tags_set:
             return False
 
         add_preset_tag(tag)
-        # Reload config to get updated presets
-        self.config = load_config()
+        # Mirror the saved change in memory instead of re-reading the file
+        self.config.tags.presets.append(tag)
+        self._refresh_presets()
         return True
 
     def format_tags_display(self, suggested: list[str]) -> str:
@@ -236,8 +379,7 @@ class Tagger:
             suggested_str = " ".join(f"[{tag}]" for tag in suggested)
             lines.append(f"建议tag: {suggested_str}")
 
-        all_tags = " | ".join(self.preset_tags)
-        lines.append(f"预设tag: {all_tags}")
+        lines.append(f"预设tag: {self.preset_tags_display}")
 
         return "\n".join(lines)
 
@@ -251,15 +393,16 @@ class Tagger:
             List of parsed tags
         """
         # Split by space or comma
-        import re
-        tags = re.split(r'[,\s]+', user_input)
+        tags = _USER_TAG_SPLIT_RE.split(user_input)
         result = []
+        seen = set()
 
         for tag in tags:
             tag = tag.strip()
             if tag.startswith("#"):
                 tag = tag[1:]
-            if tag:
+            if tag and tag not in seen:
+                seen.add(tag)
                 result.append(tag)
 
         return result
@@ -275,10 +418,13 @@ class Tagger:
         """
         valid_tags, new_tags = self.validate_tags(user_tags)
 
-        # Add new tags to presets for future use
+        # Add new tags to presets for future use, saving the config once
         if self.allow_new:
-            for tag in new_tags:
-                self.add_new_tag(tag)
+            added = [t for t in dict.fromkeys(new_tags) if t not in self.preset_tags_set]
+            if added:
+                add_preset_tags(added)
+                self.config.tags.presets.extend(added)
+                self._refresh_presets()
 
         # Return all tags (both preset and new)
         return valid_tags + new_tags
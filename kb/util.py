@@ -0,0 +1,136 @@
+"""Small helpers shared across KB modules."""
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional, TypeVar
+from urllib.parse import urlparse, urlunparse
+
+# orjson is an optional speedup for cache (de)serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def json_dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse JSON bytes or text, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def run_async(coro: Awaitable[T], eager_tasks: bool = False) -> T:
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    uvloop is not available on Windows. With eager_tasks, Python 3.12+
+    starts tasks eagerly, skipping a loop iteration for coroutines that
+    finish before their first suspension.
+    """
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        uvloop = None
+        loop_factory = None
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            if eager_tasks and hasattr(asyncio, "eager_task_factory"):
+                runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+            return runner.run(coro)
+
+    # uvloop.run (uvloop >= 0.18) replaces the deprecated uvloop.install()
+    if uvloop is not None and hasattr(uvloop, "run"):
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+async def to_thread_fast(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function in the default executor.
+
+    Like asyncio.to_thread but skips copying contextvars, for plain file
+    and config I/O that never reads them. Use asyncio.to_thread for
+    callbacks that may depend on context.
+    """
+    loop = asyncio.get_running_loop()
+    if kwargs:
+        func = functools.partial(func, **kwargs)
+    return await loop.run_in_executor(None, func, *args)
+
+
+async def bounded_gather(
+    func: Callable[[T], Awaitable[R]], items: Iterable[T], limit: int
+) -> list[R]:
+    """Await func over items concurrently, at most `limit` at a time.
+
+    Results are returned in input order; the first exception propagates
+    like asyncio.gather.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run_one(item) for item in items))
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value, or None if missing or expired."""
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if time.monotonic() >= expires_at:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove and return a value, or None if missing or expired."""
+        value = self.get(key)
+        self._items.pop(key, None)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for cache lookups (lowercase host, no fragment or trailing slash)."""
+    parsed = urlparse(url.strip())
+    path = parsed.path.rstrip("/")
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, parsed.params, parsed.query, ""))